@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Análisis de muchas posiciones en lote.
+
+Lee una posición por línea, en JSON o como cadena compacta, y escribe un
+resultado JSON por línea en el mismo orden. Las posiciones idénticas o simétricas
+se buscan una sola vez: los resultados se guardan en forma canónica en un caché
+LRU y se devuelven en la orientación de cada entrada.
+
+Entrada (el jugador por mover es opcional; por defecto se deduce de las fichas):
+    {"board": "h...m....", "player": "h", "id": "a1"}
+    h...m....
+    h...m.... m
+
+Salida:
+    {"line": 1, "id": "a1", "board": "h...m....", "player": "h", "best": 8,
+     "children": [{"position": 8, "visits": 412, "value": 0.31}, ...], "cached": false}
+
+Uso: python analysis.py posiciones.jsonl [--output resultados.jsonl] [--iterations 1000] [--workers N]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from mcts import MCTS, ICONS
+from triqui import TicTacToeBoard, Player, FULL_MASK, SYMMETRIES, _SYMMETRIC_MASKS
+
+PLAYERS = {"h": Player.HUMAN, "m": Player.MACHINE}
+
+EMPTY_CELLS = ".-_"
+
+# _INVERSE[s][c]: casilla de la entrada que la simetría `s` lleva a la casilla canónica `c`
+_INVERSE = [[symmetry.index(cell) for cell in range(9)] for symmetry in SYMMETRIES]
+
+class EvaluationCache:
+    """Caché LRU de resultados por posición canónica"""
+
+    def __init__(self, maxsize=10_000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+def parse_position(line):
+    """Devuelve (tablero en texto, jugador o None, id o None) de una línea de entrada"""
+    line = line.strip()
+    if line.startswith("{"):
+        record = json.loads(line)
+        return record["board"], record.get("player"), record.get("id")
+    board, _, player = line.partition(" ")
+    return board, player.strip() or None, None
+
+def board_masks(board):
+    if len(board) != 9:
+        raise ValueError(f"El tablero debe tener 9 casillas: {board!r}")
+    human = machine = 0
+    for i, cell in enumerate(board):
+        if cell == "h":
+            human |= 1 << i
+        elif cell == "m":
+            machine |= 1 << i
+        elif cell not in EMPTY_CELLS:
+            raise ValueError(f"Casilla desconocida {cell!r} en {board!r}")
+    return human, machine
+
+def board_winner(human, machine):
+    board = TicTacToeBoard()
+    board.set_masks(human, machine)
+    return board.check_win()
+
+def player_to_move(human, machine, player):
+    if player is not None:
+        if player not in PLAYERS:
+            raise ValueError(f"Jugador desconocido: {player!r}")
+        return PLAYERS[player]
+    humans, machines = bin(human).count("1"), bin(machine).count("1")
+    if humans == machines or machines == humans + 1:
+        return Player.HUMAN
+    if humans == machines + 1:
+        return Player.MACHINE
+    raise ValueError("No se puede deducir quién mueve: indica \"player\"")
+
+def canonical_form(human, machine):
+    """(máscara humana, máscara de la máquina, simetría) de la forma canónica de la posición"""
+    best_key, best_symmetry = None, 0
+    for symmetry, table in enumerate(_SYMMETRIC_MASKS):
+        key = table[human] << 9 | table[machine]
+        if best_key is None or key < best_key:
+            best_key, best_symmetry = key, symmetry
+    return best_key >> 9, best_key & FULL_MASK, best_symmetry
+
+def search_position(human, machine, player, iterations, time_limit_ms, solver):
+    """Busca sobre la posición canónica; devuelve el resultado en esa orientación"""
+    board = TicTacToeBoard()
+    board.set_masks(human, machine)
+    winner = board.check_win()
+    if winner != "":
+        return {"winner": winner}
+
+    mcts = MCTS(board, player, solver=solver, in_place=True)
+    result = mcts.run_search(iterations=iterations, time_limit_ms=time_limit_ms)
+    children = [(position, child.data.simulations, child.data.value)
+                for position, child in mcts.get_root_children()]
+    return {"best": result["move"].position, "children": children}
+
+class Analyzer:
+    def __init__(self, iterations=1000, time_limit_ms=None, solver=True, cache_size=10_000, workers=1,
+                 chunk_size=256):
+        self.search_args = (iterations, time_limit_ms, solver)
+        self.cache = EvaluationCache(cache_size)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.positions = 0
+        self.searches = 0
+
+    def analyze_stream(self, lines, output):
+        """Analiza las líneas de `lines` por bloques y escribe un resultado JSONL por cada una, en orden"""
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            chunk = []
+            for number, line in enumerate(lines, 1):
+                if line.strip():
+                    chunk.append((number, line))
+                if len(chunk) >= self.chunk_size:
+                    self.analyze_chunk(chunk, output, executor)
+                    chunk = []
+            if chunk:
+                self.analyze_chunk(chunk, output, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def analyze_chunk(self, chunk, output, executor):
+        entries = []
+        pending = {}
+        for number, line in chunk:
+            self.positions += 1
+            try:
+                board, player, id = parse_position(line)
+                human, machine = board_masks(board)
+                # En un tablero terminado no hace falta saber quién mueve
+                if player is not None or board_winner(human, machine) == "":
+                    player = player_to_move(human, machine, player)
+            except (ValueError, KeyError, TypeError) as error:
+                entries.append(({"line": number, "error": str(error)}, None, None, None))
+                continue
+
+            canonical_human, canonical_machine, symmetry = canonical_form(human, machine)
+            key = (canonical_human, canonical_machine, player.value if player is not None else None)
+            record = {"line": number, "id": id, "board": board}
+            if id is None:
+                del record["id"]
+            if player is not None:
+                record["player"] = ICONS[player]
+            entries.append((record, key, symmetry, self.cache.get(key)))
+            if key not in self.cache and key not in pending:
+                pending[key] = (canonical_human, canonical_machine, player) + self.search_args
+
+        # Solo se buscan las posiciones canónicas que no están en caché, en paralelo si hay pool
+        if executor is not None:
+            results = executor.map(search_position, *zip(*pending.values())) if pending else []
+        else:
+            results = (search_position(*args) for args in pending.values())
+        computed = dict(zip(pending, results))
+        for key, result in computed.items():
+            self.cache.put(key, result)
+        self.searches += len(computed)
+
+        searched = set()
+        for record, key, symmetry, result in entries:
+            if key is not None:
+                cached = result is not None
+                if result is None:
+                    result = computed[key]
+                    if key in searched:
+                        # Repetida dentro del mismo bloque: también es un acierto del caché
+                        self.cache.hits += 1
+                        cached = True
+                    searched.add(key)
+                record.update(self.orient(result, symmetry))
+                record["cached"] = cached
+            output.write(json.dumps(record) + "\n")
+
+    def orient(self, result, symmetry):
+        """Lleva un resultado canónico a la orientación de la entrada"""
+        if "winner" in result:
+            return {"winner": result["winner"]}
+        inverse = _INVERSE[symmetry]
+        children = [{"position": inverse[position], "visits": visits,
+                     "value": round(value / visits, 4) if visits else 0.0}
+                    for position, visits, value in result["children"]]
+        children.sort(key=lambda child: -child["visits"])
+        return {"best": inverse[result["best"]], "children": children}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", help="archivo de posiciones (por defecto, la entrada estándar)")
+    parser.add_argument("--output", help="archivo JSONL de resultados (por defecto, la salida estándar)")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--time-ms", type=int, default=None, help="tiempo por posición en lugar de iteraciones")
+    parser.add_argument("--no-solver", action="store_true", help="búsqueda sin MCTS-Solver")
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1, help="procesos de búsqueda")
+    args = parser.parse_args()
+
+    iterations = None if args.time_ms is not None else args.iterations
+    analyzer = Analyzer(iterations, args.time_ms, not args.no_solver, args.cache_size, args.workers)
+    source = open(args.input) if args.input else sys.stdin
+    output = open(args.output, "w") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        analyzer.analyze_stream(source, output)
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Posiciones: {analyzer.positions}, búsquedas: {analyzer.searches}, "
+          f"aciertos de caché: {analyzer.cache.hits}, {elapsed:.2f} s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
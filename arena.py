@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Arena sin interfaz: enfrenta dos agentes durante N partidas en paralelo.
+
+Agentes:
+    random          jugada aleatoria
+    perfect         juego perfecto (minimax)
+    mcts:N          MCTS con N iteraciones por jugada
+    mcts-ms:N       MCTS con N milisegundos por jugada
+    solver:N        MCTS-Solver con N iteraciones por jugada
+
+Cada partida se juega en un proceso del pool con su propia semilla; quien empieza
+se alterna. Los resultados se escriben en JSONL a medida que terminan.
+
+Uso: python arena.py mcts:1000 random --games 100 --workers 4 --output partidas.jsonl
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from mcts import MCTS
+from minimax import best_positions
+from triqui import TicTacToeBoard, GameMove, Player, get_other_player
+
+class RandomAgent:
+    def select_move(self, board, player):
+        return random.choice(board.get_legal_positions()), 0
+
+class PerfectAgent:
+    def select_move(self, board, player):
+        return random.choice(sorted(best_positions(board, player))), 0
+
+class MCTSAgent:
+    def __init__(self, iterations=None, time_limit_ms=None, solver=False):
+        self.iterations = iterations
+        self.time_limit_ms = time_limit_ms
+        self.solver = solver
+
+    def select_move(self, board, player):
+        mcts = MCTS(board.copy(), player, solver=self.solver, in_place=True)
+        result = mcts.run_search(iterations=self.iterations, time_limit_ms=self.time_limit_ms)
+        return result["move"].position, len(mcts.tree)
+
+def parse_agent(spec):
+    name, _, budget = spec.partition(":")
+    if name == "random":
+        return RandomAgent()
+    if name == "perfect":
+        return PerfectAgent()
+    if name == "mcts":
+        return MCTSAgent(iterations=int(budget or 1000))
+    if name == "mcts-ms":
+        return MCTSAgent(time_limit_ms=int(budget or 100))
+    if name == "solver":
+        return MCTSAgent(iterations=int(budget or 1000), solver=True)
+    raise ValueError(f"Agente desconocido: {spec}")
+
+def play_game(game, spec_a, spec_b, seed):
+    """Juega una partida; `a` usa las X ("h") y `b` las O ("m"). En las partidas pares empieza `a`."""
+    random.seed(seed)
+    agents = {Player.HUMAN: parse_agent(spec_a), Player.MACHINE: parse_agent(spec_b)}
+    names = {Player.HUMAN: "a", Player.MACHINE: "b"}
+
+    board = TicTacToeBoard()
+    player = Player.HUMAN if game % 2 == 0 else Player.MACHINE
+    first = names[player]
+    moves = []
+    while board.check_win() == "":
+        start = time.perf_counter()
+        position, nodes = agents[player].select_move(board, player)
+        elapsed = (time.perf_counter() - start) * 1000
+        board.make_move(GameMove(player, position))
+        moves.append({"player": names[player], "position": position, "time_ms": round(elapsed, 3), "nodes": nodes})
+        player = get_other_player(player)
+
+    winner = {"h": "a", "m": "b", "v": "draw"}[board.check_win()]
+    return {
+        "game": game,
+        "seed": seed,
+        "agents": {"a": spec_a, "b": spec_b},
+        "first": first,
+        "winner": winner,
+        "moves": moves,
+    }
+
+def run_arena(spec_a, spec_b, games, workers=None, seed=0, output=None):
+    """Juega `games` partidas y escribe cada resultado en `output` (JSONL) al terminar"""
+    # Valida los parámetros antes de lanzar los procesos
+    if games < 1:
+        raise ValueError(f"Se necesita al menos una partida: {games}")
+    for spec in (spec_a, spec_b):
+        parse_agent(spec)
+    totals = {"a": 0, "b": 0, "draw": 0}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(play_game, game, spec_a, spec_b, seed + game) for game in range(games)]
+        for future in as_completed(futures):
+            result = future.result()
+            totals[result["winner"]] += 1
+            if output is not None:
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "games": games,
+        "wins_a": totals["a"],
+        "wins_b": totals["b"],
+        "draws": totals["draw"],
+        "elapsed": elapsed,
+        "games_per_second": games / elapsed if elapsed > 0 else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("agent_a")
+    parser.add_argument("agent_b")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="archivo JSONL de resultados por partida (por defecto, ninguno)")
+    args = parser.parse_args()
+
+    output = open(args.output, "w") if args.output else None
+    try:
+        summary = run_arena(args.agent_a, args.agent_b, args.games, args.workers, args.seed, output)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        sys.exit(2)
+    finally:
+        if output is not None:
+            output.close()
+
+    games = summary["games"]
+    print(f"Partidas: {games} en {summary['elapsed']:.2f} s ({summary['games_per_second']:.1f} partidas/s)")
+    print(f"  {args.agent_a} (a): {summary['wins_a']} victorias ({summary['wins_a'] / games * 100:.1f}%)")
+    print(f"  {args.agent_b} (b): {summary['wins_b']} victorias ({summary['wins_b'] / games * 100:.1f}%)")
+    print(f"  Empates: {summary['draws']} ({summary['draws'] / games * 100:.1f}%)")
+
+if __name__ == "__main__":
+    main()
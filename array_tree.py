@@ -0,0 +1,244 @@
+from array import array
+from triqui import GameMove, Player
+
+_PLAYERS = tuple(Player)
+
+_FIELDS = ("simulations", "value", "proof", "position", "player", "parent", "first_child", "next_sibling",
+           "amaf_simulations", "amaf_value")
+
+# Valor de `proof` para los nodos sin resolver
+_UNPROVEN = 2
+
+# Valor de `parent` para los huecos liberados por `release`
+_FREED = -2
+
+class ArrayTree:
+    """Árbol de búsqueda guardado como arreglos paralelos (struct-of-arrays).
+
+    Cada nodo es un índice en arreglos tipados; los hijos se enlazan con
+    primer hijo / siguiente hermano, así que insertar no crea listas por nodo.
+    Ofrece la misma interfaz que `Tree` para que `MCTS` pueda usarlo.
+    """
+
+    def __init__(self, root):
+        self.simulations = array('l')
+        self.value = array('d')
+        self.proof = array('b')
+        self.position = array('h')
+        self.player = array('b')
+        self.parent = array('l')
+        self.first_child = array('l')
+        self.next_sibling = array('l')
+        # Estadísticas AMAF del modo RAVE
+        self.amaf_simulations = array('l')
+        self.amaf_value = array('d')
+        # Ids liberados por `release`, reutilizados por `append`
+        self.free_ids = []
+        self.append(root.data, -1)
+
+    def __len__(self):
+        return len(self.parent) - len(self.free_ids)
+
+    def append(self, data, parent_id):
+        """Añade un nodo con los datos de un `GameNode` y devuelve su id"""
+        move = data.move
+        values = (data.simulations, data.value, _UNPROVEN if data.proof is None else data.proof,
+                  -1 if move.position is None else move.position, move.player.value, parent_id, -1, -1,
+                  data.amaf_simulations, data.amaf_value)
+        if self.free_ids:
+            id = self.free_ids.pop()
+            for name, value in zip(_FIELDS, values):
+                getattr(self, name)[id] = value
+        else:
+            id = len(self.parent)
+            for name, value in zip(_FIELDS, values):
+                getattr(self, name).append(value)
+
+        if parent_id >= 0:
+            self.next_sibling[id] = self.first_child[parent_id]
+            self.first_child[parent_id] = id
+        return id
+
+    def get(self, id):
+        return ArrayNode(self, id)
+
+    def insert(self, node, parent):
+        return ArrayNode(self, self.append(node.data, parent.id))
+
+    def get_parent(self, node):
+        return ArrayNode(self, self.parent[node.id])
+
+    def get_children_id(self, id):
+        children = []
+        child_id = self.first_child[id]
+        while child_id != -1:
+            children.append(child_id)
+            child_id = self.next_sibling[child_id]
+        # Los hijos se enlazan al inicio de la lista; se devuelven en orden de inserción
+        children.reverse()
+        return children
+
+    def get_children(self, node):
+        if not node:
+            return []
+        return [ArrayNode(self, child_id) for child_id in self.get_children_id(node.id)]
+
+    def get_siblings(self, node):
+        return self.get_children(self.get_parent(node))
+
+    def get_root(self):
+        return self.get(0)
+
+    def release(self, node):
+        """Quita el subárbol de `node` dejando huecos reutilizables, sin renumerar.
+
+        Devuelve la cantidad de nodos liberados.
+        """
+        id = node.id
+        if id == 0:
+            return 0
+
+        parent_id = self.parent[id]
+        if self.first_child[parent_id] == id:
+            self.first_child[parent_id] = self.next_sibling[id]
+        else:
+            previous = self.first_child[parent_id]
+            while self.next_sibling[previous] != id:
+                previous = self.next_sibling[previous]
+            self.next_sibling[previous] = self.next_sibling[id]
+
+        released = 0
+        pending = [id]
+        while pending:
+            id = pending.pop()
+            child_id = self.first_child[id]
+            while child_id != -1:
+                pending.append(child_id)
+                child_id = self.next_sibling[child_id]
+            self.parent[id] = _FREED
+            self.free_ids.append(id)
+            released += 1
+        return released
+
+    def contains(self, node):
+        return self.parent[node.id] != _FREED
+
+    def iter_nodes(self):
+        """Recorre los nodos vivos"""
+        for id in range(len(self.parent)):
+            if self.parent[id] != _FREED:
+                yield ArrayNode(self, id)
+
+    def reroot(self, node):
+        """Convierte `node` en la nueva raíz copiando solo su subárbol.
+
+        Devuelve el mapa de ids viejos a nuevos.
+        """
+        new_ids = {node.id: 0}
+        kept = [node.id]
+        i = 0
+        while i < len(kept):
+            for child_id in self.get_children_id(kept[i]):
+                new_ids[child_id] = len(kept)
+                kept.append(child_id)
+            i += 1
+
+        for name in _FIELDS:
+            source = getattr(self, name)
+            setattr(self, name, array(source.typecode, (source[id] for id in kept)))
+
+        for new_id in range(len(kept)):
+            self.parent[new_id] = new_ids.get(self.parent[new_id], -1)
+            self.first_child[new_id] = new_ids.get(self.first_child[new_id], -1)
+            self.next_sibling[new_id] = new_ids.get(self.next_sibling[new_id], -1)
+        self.parent[0] = -1
+        self.next_sibling[0] = -1
+        self.free_ids = []
+        return new_ids
+
+    def copy(self):
+        new_tree = ArrayTree.__new__(ArrayTree)
+        for name in _FIELDS:
+            setattr(new_tree, name, array(getattr(self, name).typecode, getattr(self, name)))
+        new_tree.free_ids = self.free_ids[:]
+        return new_tree
+
+
+class ArrayNode:
+    """Vista ligera de un nodo de `ArrayTree`.
+
+    Hace las veces de `Node` y de `GameNode` (`node.data` es el mismo objeto),
+    leyendo y escribiendo directamente en los arreglos del árbol.
+    """
+    __slots__ = ("tree", "id")
+
+    def __init__(self, tree, id):
+        self.tree = tree
+        self.id = id
+
+    @property
+    def data(self):
+        return self
+
+    @property
+    def move(self):
+        position = self.tree.position[self.id]
+        return GameMove(_PLAYERS[self.tree.player[self.id]], None if position < 0 else position)
+
+    @property
+    def simulations(self):
+        return self.tree.simulations[self.id]
+
+    @simulations.setter
+    def simulations(self, value):
+        self.tree.simulations[self.id] = value
+
+    @property
+    def value(self):
+        return self.tree.value[self.id]
+
+    @value.setter
+    def value(self, value):
+        self.tree.value[self.id] = value
+
+    @property
+    def proof(self):
+        proof = self.tree.proof[self.id]
+        return None if proof == _UNPROVEN else proof
+
+    @proof.setter
+    def proof(self, value):
+        self.tree.proof[self.id] = _UNPROVEN if value is None else value
+
+    @property
+    def amaf_simulations(self):
+        return self.tree.amaf_simulations[self.id]
+
+    @amaf_simulations.setter
+    def amaf_simulations(self, value):
+        self.tree.amaf_simulations[self.id] = value
+
+    @property
+    def amaf_value(self):
+        return self.tree.amaf_value[self.id]
+
+    @amaf_value.setter
+    def amaf_value(self, value):
+        self.tree.amaf_value[self.id] = value
+
+    @property
+    def parent_id(self):
+        return self.tree.parent[self.id]
+
+    @property
+    def children_id(self):
+        return self.tree.get_children_id(self.id)
+
+    def has_n_children(self, n):
+        return len(self.children_id) == n
+
+    def is_leaf(self):
+        return self.tree.first_child[self.id] == -1
+
+    def is_root(self):
+        return self.id == 0
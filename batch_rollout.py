@@ -0,0 +1,81 @@
+"""
+Simulaciones aleatorias por lotes con NumPy.
+Juega K partidas aleatorias a la vez desde una misma posición usando operaciones
+sobre arreglos, en lugar de una partida por vez en Python puro.
+"""
+
+from triqui import Player, WIN_MASKS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesita el modo por lotes
+    np = None
+
+# Valores de las casillas en el lote
+EMPTY, HUMAN, MACHINE = 0, 1, 2
+
+def _line_matrix():
+    # _LINES[i, j] = 1 si la casilla i pertenece a la línea ganadora j
+    lines = np.zeros((9, len(WIN_MASKS)), dtype=np.int8)
+    for j, mask in enumerate(WIN_MASKS):
+        for i in range(9):
+            if mask >> i & 1:
+                lines[i, j] = 1
+    return lines
+
+_LINES = _line_matrix() if np is not None else None
+
+def make_rng(seed=None):
+    if np is None:
+        raise ImportError("Las simulaciones por lotes necesitan NumPy")
+    return np.random.default_rng(seed)
+
+def batch_rollout(board, player, count, rng=None):
+    """Juega `count` partidas aleatorias desde `board`, empezando por `player`.
+
+    Devuelve los conteos agregados {"h": victorias humano, "m": victorias máquina, "v": empates}.
+    """
+    if rng is None:
+        rng = make_rng()
+
+    winner = board.check_win()
+    if winner != "":
+        counts = {"h": 0, "m": 0, "v": 0}
+        counts[winner] = count
+        return counts
+
+    cells = np.zeros((count, 9), dtype=np.int8)
+    for i in range(9):
+        if board.human >> i & 1:
+            cells[:, i] = HUMAN
+        elif board.machine >> i & 1:
+            cells[:, i] = MACHINE
+
+    # 0 en juego, HUMAN / MACHINE ganador, 3 empate
+    outcome = np.zeros(count, dtype=np.int8)
+    mover = HUMAN if player == Player.HUMAN else MACHINE
+
+    # Todas las partidas avanzan al mismo ritmo, así que en cada jugada mueve el mismo jugador
+    while True:
+        active = outcome == 0
+        rows = np.flatnonzero(active)
+        if rows.size == 0:
+            break
+
+        # Jugada aleatoria uniforme entre las casillas vacías: máximo de puntajes aleatorios enmascarados
+        scores = np.where(cells[rows] == EMPTY, rng.random((rows.size, 9)), -1.0)
+        cells[rows, scores.argmax(axis=1)] = mover
+
+        line_counts = (cells[rows] == mover).astype(np.int8) @ _LINES
+        won = (line_counts == 3).any(axis=1)
+        full = (cells[rows] != EMPTY).all(axis=1)
+        outcome[rows[won]] = mover
+        outcome[rows[full & ~won]] = 3
+
+        mover = MACHINE if mover == HUMAN else HUMAN
+
+    return {
+        "h": int(np.count_nonzero(outcome == HUMAN)),
+        "m": int(np.count_nonzero(outcome == MACHINE)),
+        "v": int(np.count_nonzero(outcome == 3)),
+    }
@@ -0,0 +1,54 @@
+"""
+Memoria reservada por iteración de MCTS (tracemalloc): iteración con copias
+contra iteración en el sitio (make/undo sobre un único tablero).
+
+Uso: python -m benchmarks.bench_allocations [--iterations N]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from mcts import MCTS
+from triqui import TicTacToeBoard, GameMove, Player
+
+def measure(in_place, iterations, warmup=200):
+    random.seed(0)
+    board = TicTacToeBoard()
+    board.make_move(GameMove(Player.HUMAN, 0))
+    mcts = MCTS(board, Player.MACHINE, in_place=in_place)
+    for _ in range(warmup):
+        mcts.run_search_iteration()
+
+    tracemalloc.start()
+    transient = 0
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(iterations):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        mcts.run_search_iteration()
+        # Lo que se reservó por encima de lo que ya había, aunque se haya liberado después
+        transient += tracemalloc.get_traced_memory()[1] - current
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        mcts.run_search_iteration()
+    rate = iterations / (time.perf_counter() - start)
+    return transient / iterations, retained / iterations, rate
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'Modo':<10} | {'Pico B/iter':>11} | {'Retenido B/iter':>15} | {'Iter/s':>8}")
+    print("-" * 54)
+    for name, in_place in (("copias", False), ("en sitio", True)):
+        transient, retained, rate = measure(in_place, args.iterations)
+        print(f"{name:<10} | {transient:11.0f} | {retained:15.0f} | {rate:8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Exportación del árbol con `export.walk_tree`: nodos/s y memoria pico al volcar
+un árbol grande completo en JSONL y en DOT, y con cortes (profundidad, visitas
+mínimas, k mejores hijos). También desde una instantánea cargada con mmap, y
+comprueba que se puede exportar e imprimir tras `advance` y `remove` sobre ella.
+
+Uso: python -m benchmarks.bench_export [--nodes 1000000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_tree import build_tree
+from export import write_jsonl, write_dot
+from mcts import MCTS
+from tree import Tree
+from triqui import TicTacToeBoard, Player
+
+CASES = (
+    ("JSONL completo", write_jsonl, {}),
+    ("DOT completo", write_dot, {}),
+    ("JSONL prof. 4, top 3", write_jsonl, {"max_depth": 4, "top_k": 3}),
+    ("JSONL visitas >= 50", write_jsonl, {"min_visits": 50}),
+)
+
+def fill_visits(tree, seed=0):
+    # Visitas decrecientes con la profundidad para que los cortes por visitas tengan efecto
+    rng = random.Random(seed)
+    for node in reversed(tree.nodes):
+        node.data.simulations += 1 + rng.randrange(3)
+        if node.id != 0:
+            tree.get(node.parent_id).data.simulations += node.data.simulations
+
+def measure(tree, writer, cutoffs):
+    with open(os.devnull, "w") as output:
+        start = time.perf_counter()
+        count = writer(tree, output, **cutoffs)
+        elapsed = time.perf_counter() - start
+        # Segunda pasada solo para la memoria: tracemalloc hace más lento el recorrido
+        tracemalloc.start()
+        writer(tree, output, **cutoffs)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return count, count / elapsed, peak
+
+def check_rerooted(path):
+    """Carga la instantánea, avanza la raíz y quita un subárbol; devuelve la lista de problemas al exportar"""
+    problems = []
+    loaded = MCTS.load(path)
+    _, child = max(loaded.get_root_children(), key=lambda pair: pair[1].data.simulations)
+    loaded.advance(child.data.move.copy())
+    for step in ("advance", "remove"):
+        if step == "remove":
+            children = loaded.tree.get_children(loaded.tree.get(0))
+            if not children:
+                break
+            loaded.tree.remove(children[0])
+        nodes = sum(1 for _ in loaded.tree.iter_nodes())
+        for name, writer in (("JSONL", write_jsonl), ("DOT", write_dot)):
+            count = writer(loaded.tree, io.StringIO())
+            if count != nodes:
+                problems.append(f"{name} tras {step}: {count} nodos exportados de {nodes}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            loaded.print_tree_structure()
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--path", default=os.path.join(tempfile.gettempdir(), "triqui_export.snap"))
+    args = parser.parse_args()
+
+    mcts = MCTS(TicTacToeBoard(), Player.MACHINE)
+    mcts.tree = build_tree(Tree, args.nodes)
+    fill_visits(mcts.tree)
+    mcts.save(args.path)
+
+    print(f"{'Caso':<22} | {'Origen':<8} | {'Nodos':>9} | {'Nodos/s':>9} | {'Pico (KiB)':>10}")
+    print("-" * 70)
+    for name, writer, cutoffs in CASES:
+        count, rate, peak = measure(mcts.tree, writer, cutoffs)
+        print(f"{name:<22} | {'memoria':<8} | {count:9d} | {rate:9.0f} | {peak / 1024:10.1f}")
+    del mcts
+
+    for name, writer, cutoffs in CASES:
+        loaded = MCTS.load(args.path)
+        count, rate, peak = measure(loaded.tree, writer, cutoffs)
+        print(f"{name:<22} | {'mmap':<8} | {count:9d} | {rate:9.0f} | {peak / 1024:10.1f}")
+        del loaded
+
+    problems = check_rerooted(args.path)
+    os.remove(args.path)
+    for problem in problems:
+        print(problem)
+    if problems:
+        sys.exit(1)
+    print("\nExportación tras advance y remove sobre la instantánea: consistente")
+
+if __name__ == "__main__":
+    main()
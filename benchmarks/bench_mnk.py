@@ -0,0 +1,55 @@
+"""
+Simulaciones por segundo de `MNKBoard` a medida que crece el tablero.
+
+Cada simulación juega al azar desde el tablero vacío y se deshace con `unplay`,
+así que se mide solo el costo por jugada (revisión de victoria y casillas libres).
+
+Uso: python -m benchmarks.bench_mnk [--rollouts N] [--sizes 3x3x3 15x15x5 ...]
+"""
+
+import argparse
+import random
+import time
+
+from mnk import MNKBoard
+from triqui import TicTacToeBoard, Player, get_other_player
+
+SIZES = ("3x3x3", "7x7x4", "9x9x5", "15x15x5", "19x19x5")
+
+def rollouts(board, count, seed=0):
+    """Devuelve (simulaciones por segundo, jugadas promedio por simulación)"""
+    random.seed(seed)
+    plies = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        played = []
+        player = Player.HUMAN
+        while board.check_win() == "":
+            position = board.random_legal_position()
+            board.play(position, player)
+            played.append(position)
+            player = get_other_player(player)
+        plies += len(played)
+        for position in reversed(played):
+            board.unplay(position)
+    elapsed = time.perf_counter() - start
+    return count / elapsed, plies / count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rollouts", type=int, default=2_000)
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), help="tableros como MxNxK")
+    args = parser.parse_args()
+
+    print(f"{'Tablero':<15} | {'Casillas':>8} | {'Simul/s':>8} | {'Jugadas':>7} | {'µs/jugada':>9}")
+    print("-" * 60)
+    rate, plies = rollouts(TicTacToeBoard(), args.rollouts)
+    print(f"{'TicTacToeBoard':<15} | {9:8d} | {rate:8.0f} | {plies:7.1f} | {1e6 / (rate * plies):9.2f}")
+    for size in args.sizes:
+        m, n, k = (int(value) for value in size.split("x"))
+        board = MNKBoard(m, n, k)
+        rate, plies = rollouts(board, args.rollouts)
+        print(f"{size:<15} | {board.cells:8d} | {rate:8.0f} | {plies:7.1f} | {1e6 / (rate * plies):9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Escalamiento de la búsqueda paralela en la raíz con 1, 2, 4 y 8 procesos
+para un mismo presupuesto de tiempo por jugada.
+
+Uso: python -m benchmarks.bench_parallel [--time-ms N] [--rounds N]
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from mcts import MCTS
+from minimax import best_positions
+from triqui import TicTacToeBoard, GameMove, Player
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--time-ms", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    board = TicTacToeBoard()
+    board.make_move(GameMove(Player.HUMAN, 1))
+    optimal = best_positions(board, Player.MACHINE)
+
+    print(f"{'Procesos':>8} | {'Iteraciones':>11} | {'Iter/s':>8} | {'Aceleración':>11} | {'Óptima':>6}")
+    print("-" * 58)
+    base_rate = None
+    for workers in args.workers:
+        with ProcessPoolExecutor(workers) as executor:
+            # Calentamiento: arranca los procesos antes de medir
+            MCTS(board.copy()).run_parallel_search(workers, iterations=1, seed=0, executor=executor)
+
+            iterations = 0
+            correct = 0
+            start = time.perf_counter()
+            for round in range(args.rounds):
+                mcts = MCTS(board.copy())
+                result = mcts.run_parallel_search(workers, time_limit_ms=args.time_ms, seed=round * 100,
+                                                  executor=executor)
+                iterations += result["iterations"]
+                correct += result["move"].position in optimal
+            elapsed = time.perf_counter() - start
+
+        rate = iterations / elapsed
+        base_rate = base_rate or rate
+        print(f"{workers:8d} | {iterations:11d} | {rate:8.0f} | {rate / base_rate:10.2f}x | {correct}/{args.rounds}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Iteraciones hasta la jugada correcta por política de simulación.
+
+Para cada posición táctica y cada semilla se busca en pasos de `--step`
+iteraciones hasta `--max-iterations`; cuenta la primera cantidad de iteraciones a
+partir de la cual el hijo más visitado de la raíz es óptimo (según minimax) y lo
+sigue siendo hasta el final. Si nunca se estabiliza cuenta como el máximo.
+
+Uso: python -m benchmarks.bench_policies [--seeds N] [--step N] [--max-iterations N]
+"""
+
+import argparse
+import random
+import time
+
+from mcts import MCTS
+from minimax import best_positions
+from policies import RandomPolicy, HeuristicPolicy
+from triqui import TicTacToeBoard, Player, get_other_player
+
+# Jugadas alternadas empezando por el humano
+TACTICAL_POSITIONS = {
+    "ganar": [0, 3, 1, 4],
+    "bloquear": [0, 4, 1],
+    "bloquear tarde": [0, 4, 8, 1, 7],
+    "doble amenaza": [0, 4, 8, 2],
+    "esquina opuesta": [4, 0, 8],
+    "evitar doble": [0, 4, 8],
+}
+
+POLICIES = (("aleatoria", RandomPolicy), ("heurística", HeuristicPolicy))
+
+def build_position(moves):
+    board = TicTacToeBoard()
+    player = Player.HUMAN
+    for position in moves:
+        board.play(position, player)
+        player = get_other_player(player)
+    return board, player
+
+def iterations_to_correct(board, player, best, policy, seed, step, max_iterations):
+    random.seed(seed)
+    mcts = MCTS(board.copy(), player, in_place=True, rollout_policy=policy)
+    stable_since = None
+    done = 0
+    while done < max_iterations:
+        for _ in range(step):
+            mcts.run_search_iteration()
+        done += step
+        position, _ = max(mcts.get_root_children(), key=lambda pair: pair[1].data.simulations)
+        if position in best:
+            if stable_since is None:
+                stable_since = done
+        else:
+            stable_since = None
+    return stable_since if stable_since is not None else max_iterations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--step", type=int, default=10)
+    parser.add_argument("--max-iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    positions = {}
+    for name, moves in TACTICAL_POSITIONS.items():
+        board, player = build_position(moves)
+        positions[name] = (board, player, best_positions(board, player))
+
+    header = " | ".join(f"{name:>10}" for name, _ in POLICIES)
+    print(f"{'Posición':<16} | {'Óptimas':<12} | {header}")
+    print("-" * (34 + 13 * len(POLICIES)))
+    totals = {name: 0.0 for name, _ in POLICIES}
+    for name, (board, player, best) in positions.items():
+        row = []
+        for policy_name, policy_class in POLICIES:
+            average = sum(iterations_to_correct(board, player, best, policy_class(), seed, args.step,
+                                                args.max_iterations)
+                          for seed in range(args.seeds)) / args.seeds
+            totals[policy_name] += average
+            row.append(f"{average:10.0f}")
+        print(f"{name:<16} | {str(sorted(best)):<12} | {' | '.join(row)}")
+    print(f"{'Promedio':<16} | {'':<12} | " + " | ".join(f"{totals[n] / len(positions):10.0f}" for n, _ in POLICIES))
+
+    # Costo por iteración desde el tablero vacío
+    row = []
+    for _, policy_class in POLICIES:
+        random.seed(0)
+        mcts = MCTS(TicTacToeBoard(), Player.MACHINE, in_place=True, rollout_policy=policy_class())
+        start = time.perf_counter()
+        for _ in range(args.max_iterations):
+            mcts.run_search_iteration()
+        row.append(f"{(time.perf_counter() - start) / args.max_iterations * 1e6:10.1f}")
+    print(f"{'µs/iteración':<16} | {'':<12} | {' | '.join(row)}")
+
+if __name__ == "__main__":
+    main()
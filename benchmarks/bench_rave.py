@@ -0,0 +1,62 @@
+"""
+Compara MCTS con y sin RAVE a igual tiempo de CPU por jugada: porcentaje de
+jugadas que coinciden con el juego perfecto (minimax) sobre posiciones al azar
+en las que no todas las jugadas son óptimas.
+
+Uso: python -m benchmarks.bench_rave [--positions N] [--time-ms 5 20 50] [--rave-k N]
+"""
+
+import argparse
+import random
+
+from mcts import MCTS, RAVE_K
+from minimax import best_positions
+from triqui import TicTacToeBoard, Player, get_other_player
+
+def sample_positions(count, seed=0):
+    """Posiciones (tablero, jugador) alcanzadas jugando al azar, con al menos una jugada no óptima"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = TicTacToeBoard()
+        player = rng.choice(list(Player))
+        for _ in range(rng.randrange(8)):
+            board.play(rng.choice(board.get_legal_positions()), player)
+            player = get_other_player(player)
+            if board.check_win() != "":
+                break
+        if board.check_win() != "":
+            continue
+        best = best_positions(board, player)
+        if len(best) < len(board.get_legal_positions()):
+            positions.append((board, player, best))
+    return positions
+
+def agreement(positions, time_ms, rave, rave_k, seed=0):
+    random.seed(seed)
+    correct = 0
+    iterations = 0
+    for board, player, best in positions:
+        mcts = MCTS(board.copy(), player, in_place=True, rave=rave, rave_k=rave_k)
+        result = mcts.run_search(time_limit_ms=time_ms)
+        correct += result["move"].position in best
+        iterations += mcts.tree.get(0).data.simulations
+    return correct / len(positions), iterations / len(positions)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--positions", type=int, default=100)
+    parser.add_argument("--time-ms", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--rave-k", type=int, default=RAVE_K)
+    args = parser.parse_args()
+
+    positions = sample_positions(args.positions)
+    print(f"{'ms/jugada':>9} | {'Modo':<5} | {'Óptimas':>7} | {'Iteraciones':>11}")
+    print("-" * 42)
+    for time_ms in args.time_ms:
+        for name, rave in (("UCB1", False), ("RAVE", True)):
+            rate, iterations = agreement(positions, time_ms, rave, args.rave_k)
+            print(f"{time_ms:9d} | {name:<5} | {rate * 100:6.1f}% | {iterations:11.0f}")
+
+if __name__ == "__main__":
+    main()
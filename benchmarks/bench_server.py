@@ -0,0 +1,109 @@
+"""
+Generador de carga para el servidor de partidas (server.py).
+
+Abre `--clients` conexiones; cada una juega `--games` partidas seguidas con
+jugadas humanas aleatorias. Reporta jugadas por segundo y la latencia p50/p99
+de cada petición. Sin --host/--port/--unix levanta un servidor en el mismo proceso.
+
+Uso: python -m benchmarks.bench_server [--clients 200] [--games 5] [--time-ms 20] [--workers N]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from server import GameServer
+
+# Espera antes de reintentar una petición rechazada con "busy" (s)
+BUSY_BACKOFF = 0.01
+
+async def request(reader, writer, message, latencies, errors):
+    """Envía una petición y espera la respuesta; si el servidor está ocupado, reintenta"""
+    line = json.dumps(message).encode() + b"\n"
+    while True:
+        start = time.perf_counter()
+        writer.write(line)
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        if response["ok"]:
+            latencies.append(time.perf_counter() - start)
+            return response
+        errors.append(response["error"])
+        if response["error"] != "busy":
+            return response
+        await asyncio.sleep(BUSY_BACKOFF)
+
+async def run_client(connect, games, time_ms, seed, latencies, errors, moves):
+    rng = random.Random(seed)
+    reader, writer = await connect()
+    try:
+        for game in range(games):
+            first = "machine" if game % 2 else "human"
+            response = await request(reader, writer, {"op": "new", "first": first, "time_ms": time_ms},
+                                     latencies, errors)
+            game_id = response.get("game")
+            moves.append("machine" in response)
+            while response["ok"] and response["winner"] == "":
+                empty = [i for i, cell in enumerate(response["board"]) if cell == "."]
+                response = await request(reader, writer, {"op": "move", "game": game_id,
+                                                          "position": rng.choice(empty), "time_ms": time_ms},
+                                         latencies, errors)
+                moves.append("machine" in response)
+            if game_id is not None:
+                await request(reader, writer, {"op": "close", "game": game_id}, [], errors)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+async def run(args):
+    game_server = None
+    if args.unix:
+        connect = lambda: asyncio.open_unix_connection(args.unix)
+    elif args.port:
+        connect = lambda: asyncio.open_connection(args.host, args.port)
+    else:
+        game_server = GameServer(args.workers, max_pending=args.max_pending)
+        server = await game_server.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        connect = lambda: asyncio.open_connection("127.0.0.1", port)
+
+    latencies = []
+    errors = []
+    moves = []
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(run_client(connect, args.games, args.time_ms, client, latencies, errors, moves)
+                               for client in range(args.clients)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if game_server is not None:
+            await game_server.stop(server)
+
+    print(f"Clientes: {args.clients}, partidas: {args.clients * args.games}, tiempo por jugada: {args.time_ms} ms")
+    machine_moves = sum(moves)
+    print(f"Jugadas de la máquina: {machine_moves} en {elapsed:.2f} s ({machine_moves / elapsed:.1f} jugadas/s)")
+    print(f"Latencia por petición p50: {percentile(latencies, 0.50) * 1000:.1f} ms, p99: {percentile(latencies, 0.99) * 1000:.1f} ms")
+    if errors:
+        print(f"Rechazos: {len(errors)} ({errors.count('busy')} busy, reintentados)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--games", type=int, default=5, help="partidas por cliente")
+    parser.add_argument("--time-ms", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None, help="procesos del servidor en el mismo proceso")
+    parser.add_argument("--max-pending", type=int, default=1024)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="puerto de un servidor ya en marcha")
+    parser.add_argument("--unix", help="socket Unix de un servidor ya en marcha")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Instantáneas del árbol: tiempo de guardado, bytes por nodo, tiempo de carga
+con mmap y tiempo hasta tener la jugada recomendada tras cargar.
+
+Uso: python -m benchmarks.bench_snapshot [--nodes 100000 1000000] [--path arbol.snap]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_tree import build_tree
+from mcts import MCTS
+from tree import Tree
+from triqui import TicTacToeBoard, Player
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--path", default=os.path.join(tempfile.gettempdir(), "triqui_bench.snap"))
+    args = parser.parse_args()
+
+    print(f"{'Nodos':>9} | {'Guardar (s)':>11} | {'Bytes/nodo':>10} | {'Cargar (ms)':>11} | {'Jugada (ms)':>11} | {'Leídos':>6}")
+    print("-" * 75)
+    for nodes in args.nodes:
+        mcts = MCTS(TicTacToeBoard(), Player.MACHINE)
+        mcts.tree = build_tree(Tree, nodes)
+
+        start = time.perf_counter()
+        saved = mcts.save(args.path)
+        save_time = time.perf_counter() - start
+        size = os.path.getsize(args.path)
+        del mcts
+
+        start = time.perf_counter()
+        loaded = MCTS.load(args.path)
+        load_time = time.perf_counter() - start
+
+        # Primera consulta útil: el hijo más visitado de la raíz
+        start = time.perf_counter()
+        max(loaded.get_root_children(), key=lambda pair: pair[1].data.simulations)
+        first_use = time.perf_counter() - start
+
+        read = len(loaded.tree.nodes.cache)
+        print(f"{saved:9d} | {save_time:11.2f} | {size / saved:10.1f} | {load_time * 1000:11.3f} | "
+              f"{first_use * 1000:11.3f} | {read:6d}")
+        del loaded
+
+    os.remove(args.path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compara `TicTacToeBoard` (máscaras de bits) con `StateBoard` (tablas de posiciones):
+simulaciones por segundo e iteraciones de MCTS por segundo, además del tiempo de
+construir las tablas frente a leerlas del caché en disco.
+
+Uso: python -m benchmarks.bench_states [--rollouts N] [--iterations N]
+"""
+
+import argparse
+import random
+import time
+
+import states
+from mcts import MCTS
+from states import StateBoard
+from triqui import TicTacToeBoard, Player
+
+BOARDS = (("TicTacToeBoard", TicTacToeBoard), ("StateBoard", StateBoard))
+
+def rollouts_per_second(board_class, rollouts, seed=0):
+    random.seed(seed)
+    mcts = MCTS(board_class(), Player.MACHINE)
+    root = mcts.tree.get(0)
+    start = time.perf_counter()
+    for _ in range(rollouts):
+        mcts.simulate(root, mcts.model.copy())
+    return rollouts / (time.perf_counter() - start)
+
+def iterations_per_second(board_class, iterations, in_place, seed=0):
+    random.seed(seed)
+    mcts = MCTS(board_class(), Player.MACHINE, in_place=in_place)
+    start = time.perf_counter()
+    # run_search puede terminar antes de agotar las iteraciones pedidas
+    result = mcts.run_search(iterations=iterations)
+    return result["iterations"] / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rollouts", type=int, default=50_000)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    tables = states.get_tables()
+    start = time.perf_counter()
+    states.build_tables()
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    states.read_tables()
+    read_time = time.perf_counter() - start
+    print(f"Posiciones: {len(tables)}, construir: {build_time * 1000:.1f} ms, leer caché: {read_time * 1000:.1f} ms\n")
+
+    print(f"{'Tablero':<15} | {'Simul/s':>8} | {'Iter/s':>8} | {'Iter/s en el sitio':>18}")
+    print("-" * 59)
+    for name, board_class in BOARDS:
+        rollouts = rollouts_per_second(board_class, args.rollouts)
+        copy_path = iterations_per_second(board_class, args.iterations, in_place=False)
+        in_place = iterations_per_second(board_class, args.iterations, in_place=True)
+        print(f"{name:<15} | {rollouts:8.0f} | {copy_path:8.0f} | {in_place:18.0f}")
+
+if __name__ == "__main__":
+    main()
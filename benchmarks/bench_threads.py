@@ -0,0 +1,96 @@
+"""
+Búsqueda paralela en el árbol (`MCTS.run_threaded_search`) con 1, 2, 4 y 8 hilos
+para un mismo presupuesto de tiempo, y una prueba de estrés de consistencia.
+
+La prueba de estrés corre muchos hilos sobre un mismo árbol y revisa que:
+    - cada iteración termine en exactamente un nodo: la suma, sobre todos los
+      nodos, de sus visitas menos las de sus hijos es igual a las iteraciones;
+    - la raíz tenga tantas visitas como iteraciones;
+    - no queden pérdidas virtuales pendientes;
+    - los ids sean únicos y coherentes y ningún nodo tenga dos hijos con la misma jugada.
+
+Solo se espera aceleración en CPython sin GIL (free-threaded).
+
+Uso: python -m benchmarks.bench_threads [--time-ms N] [--threads 1 2 4 8] [--stress-iterations N]
+"""
+
+import argparse
+import sys
+import time
+
+from mcts import MCTS, gil_enabled
+from triqui import TicTacToeBoard, Player
+
+def check_consistency(mcts, iterations):
+    """Devuelve la lista de problemas encontrados en el árbol"""
+    tree = mcts.tree
+    problems = []
+    root = tree.get(0)
+    if root.data.simulations != iterations:
+        problems.append(f"la raíz tiene {root.data.simulations} visitas, se esperaban {iterations}")
+
+    ended = 0
+    for id, node in enumerate(tree.nodes):
+        if node.id != id:
+            problems.append(f"el nodo en la posición {id} tiene id {node.id}")
+        if node.data.virtual_loss != 0:
+            problems.append(f"el nodo {id} quedó con pérdida virtual {node.data.virtual_loss}")
+        children = tree.get_children(node)
+        positions = [child.data.move.position for child in children]
+        if len(set(positions)) != len(positions):
+            problems.append(f"el nodo {id} tiene hijos repetidos: {positions}")
+        for child in children:
+            if child.parent_id != id:
+                problems.append(f"el hijo {child.id} de {id} apunta al padre {child.parent_id}")
+        ended += node.data.simulations - sum(child.data.simulations for child in children)
+    if ended != iterations:
+        problems.append(f"las visitas propias suman {ended}, se esperaban {iterations}")
+    return problems
+
+def stress(threads, iterations, rounds):
+    # Cambios de hilo muy frecuentes para forzar intercalados también con GIL
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for round in range(rounds):
+            mcts = MCTS(TicTacToeBoard(), Player.MACHINE)
+            result = mcts.run_threaded_search(threads=threads, iterations=iterations)
+            problems = check_consistency(mcts, result["iterations"])
+            if problems:
+                print(f"Ronda {round}: {len(problems)} problemas")
+                for problem in problems[:10]:
+                    print(f"  {problem}")
+                return False
+    finally:
+        sys.setswitchinterval(interval)
+    print(f"Estrés: {rounds} rondas de {iterations} iteraciones con {threads} hilos, árbol consistente")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--time-ms", type=int, default=500)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--stress-threads", type=int, default=8)
+    parser.add_argument("--stress-iterations", type=int, default=20_000)
+    parser.add_argument("--stress-rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"GIL activo: {'sí' if gil_enabled() else 'no'}\n")
+    print(f"{'Hilos':>5} | {'Iteraciones':>11} | {'Iter/s':>8} | {'Aceleración':>11}")
+    print("-" * 44)
+    base_rate = None
+    for threads in args.threads:
+        mcts = MCTS(TicTacToeBoard(), Player.MACHINE)
+        start = time.perf_counter()
+        # Sin tope de iteraciones: solo cuenta el tiempo
+        result = mcts.run_threaded_search(threads=threads, iterations=None, time_limit_ms=args.time_ms)
+        rate = result["iterations"] / (time.perf_counter() - start)
+        base_rate = base_rate or rate
+        print(f"{threads:5d} | {result['iterations']:11d} | {rate:8.0f} | {rate / base_rate:10.2f}x")
+    print()
+
+    if not stress(args.stress_threads, args.stress_iterations, args.stress_rounds):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
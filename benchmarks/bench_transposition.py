@@ -0,0 +1,60 @@
+"""
+Compara MCTS sobre árbol contra MCTS con transposiciones y simetrías:
+número de nodos y porcentaje de jugadas óptimas (según minimax) con el mismo presupuesto.
+
+Uso: python -m benchmarks.bench_transposition [--trials N]
+"""
+
+import argparse
+import random
+
+from mcts import MCTS
+from minimax import best_positions
+from triqui import TicTacToeBoard, GameMove, Player
+
+# Posiciones de prueba (jugadas humanas y de la máquina alternadas); siempre mueve la máquina
+POSITIONS = {
+    "vacío": [],
+    "esquina": [0],
+    "borde": [1],
+    "medio juego": [0, 4, 8],
+    "amenaza": [0, 4, 1],
+}
+
+def build_board(moves):
+    board = TicTacToeBoard()
+    player = Player.HUMAN if len(moves) % 2 == 1 else Player.MACHINE
+    for position in moves:
+        board.make_move(GameMove(player, position))
+        player = Player.MACHINE if player == Player.HUMAN else Player.HUMAN
+    return board
+
+def run(moves, iterations, transpositions, trials):
+    board = build_board(moves)
+    optimal = best_positions(board, Player.MACHINE)
+    nodes = 0
+    correct = 0
+    for seed in range(trials):
+        random.seed(seed)
+        mcts = MCTS(board.copy(), Player.MACHINE, transpositions=transpositions)
+        result = mcts.run_search(iterations=iterations)
+        nodes += len(mcts.tree)
+        correct += result["move"].position in optimal
+    return nodes / trials, correct / trials * 100
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--budgets", type=int, nargs="+", default=[100, 300, 1000])
+    args = parser.parse_args()
+
+    print(f"{'Posición':<12} | {'Iter':>5} | {'Nodos árbol':>11} | {'Nodos DAG':>9} | {'Óptima árbol':>12} | {'Óptima DAG':>10}")
+    print("-" * 75)
+    for name, moves in POSITIONS.items():
+        for iterations in args.budgets:
+            tree_nodes, tree_ok = run(moves, iterations, False, args.trials)
+            dag_nodes, dag_ok = run(moves, iterations, True, args.trials)
+            print(f"{name:<12} | {iterations:5d} | {tree_nodes:11.0f} | {dag_nodes:9.0f} | {tree_ok:11.0f}% | {dag_ok:9.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compara el árbol de objetos `Tree` con el árbol en arreglos `ArrayTree`:
+memoria por nodo e iteraciones por segundo de MCTS.
+
+Uso: python -m benchmarks.bench_tree [--nodes N] [--iterations N]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from array_tree import ArrayTree
+from mcts import MCTS, GameNode
+from tree import Tree, Node
+from triqui import TicTacToeBoard, GameMove, Player
+
+BACKENDS = (("Tree", Tree), ("ArrayTree", ArrayTree))
+
+def build_tree(tree_class, nodes, seed=0):
+    rng = random.Random(seed)
+    tree = tree_class(Node(GameNode(GameMove(Player.HUMAN, None))))
+    parents = [tree.get(0)]
+    for _ in range(nodes - 1):
+        parent = rng.choice(parents)
+        player = Player.MACHINE if parent.data.move.player == Player.HUMAN else Player.HUMAN
+        parents.append(tree.insert(Node(GameNode(GameMove(player, rng.randrange(9)))), parent))
+    return tree
+
+def bytes_per_node(tree_class, nodes):
+    # Se mide lo que queda vivo del árbol, sin la lista auxiliar de padres
+    tracemalloc.start()
+    tree = build_tree(tree_class, nodes)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return current / nodes
+
+def iterations_per_second(tree_class, iterations, seed=0):
+    random.seed(seed)
+    mcts = MCTS(TicTacToeBoard(), Player.MACHINE, tree_class=tree_class)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        mcts.run_search_iteration()
+    return iterations / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(f"{'Árbol':<10} | {'Bytes/nodo':>10} | {'Iter/s':>8}")
+    print("-" * 34)
+    for name, tree_class in BACKENDS:
+        memory = bytes_per_node(tree_class, args.nodes)
+        speed = iterations_per_second(tree_class, args.iterations)
+        print(f"{name:<10} | {memory:10.1f} | {speed:8.0f}")
+
+if __name__ == "__main__":
+    main()
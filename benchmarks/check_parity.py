@@ -0,0 +1,115 @@
+"""
+Comprueba que el `TicTacToeBoard` de bits se comporta igual que el tablero de
+listas original en todas las posiciones alcanzables, empiece quien empiece.
+
+Para cada par (posición, jugador por mover) compara la cuadrícula, `check_win`,
+`get_legal_positions`, `has_legal_positions` e `is_legal_position`, y luego
+sigue por cada jugada legal. Termina con código 1 si encuentra diferencias.
+
+Uso: python -m benchmarks.check_parity
+"""
+
+import sys
+
+from triqui import TicTacToeBoard, GameMove, Player, get_other_player
+
+def are_equal(arr):
+    return all(x == arr[0] for x in arr) and arr[0] != ""
+
+class ListBoard:
+    """Copia del tablero original, una lista de 9 casillas"""
+
+    def __init__(self):
+        self.grid = [""] * 9
+
+    def make_move(self, move):
+        self.grid[move.position] = "h" if move.player == Player.HUMAN else "m"
+
+    def get_legal_positions(self):
+        return [i for i, cell in enumerate(self.grid) if cell == ""]
+
+    def has_legal_positions(self):
+        return len(self.get_legal_positions()) > 0
+
+    def is_legal_position(self, position):
+        return position in self.get_legal_positions()
+
+    def check_win(self):
+        # Rows
+        if are_equal([self.grid[0], self.grid[1], self.grid[2]]): return self.grid[0]
+        if are_equal([self.grid[3], self.grid[4], self.grid[5]]): return self.grid[3]
+        if are_equal([self.grid[6], self.grid[7], self.grid[8]]): return self.grid[6]
+
+        # Columns
+        if are_equal([self.grid[0], self.grid[3], self.grid[6]]): return self.grid[0]
+        if are_equal([self.grid[1], self.grid[4], self.grid[7]]): return self.grid[1]
+        if are_equal([self.grid[2], self.grid[5], self.grid[8]]): return self.grid[2]
+
+        # Diagonals
+        if are_equal([self.grid[0], self.grid[4], self.grid[8]]): return self.grid[4]
+        if are_equal([self.grid[2], self.grid[4], self.grid[6]]): return self.grid[4]
+
+        # Draw
+        if not self.has_legal_positions():
+            return "v"
+
+        return ""
+
+    def copy(self):
+        board = ListBoard()
+        board.grid = self.grid[:]
+        return board
+
+def compare(board, reference):
+    """Lista de diferencias entre el tablero de bits y el de referencia"""
+    problems = []
+    if board.grid != reference.grid:
+        problems.append(f"grid {board.grid} != {reference.grid}")
+    for name in ("check_win", "get_legal_positions", "has_legal_positions"):
+        ours, theirs = getattr(board, name)(), getattr(reference, name)()
+        if ours != theirs:
+            problems.append(f"{name}: {ours!r} != {theirs!r}")
+    for position in range(-1, 10):
+        if board.is_legal_position(position) != reference.is_legal_position(position):
+            problems.append(f"is_legal_position({position})")
+    return problems
+
+def walk(first):
+    """Recorre las posiciones alcanzables empezando por `first`; devuelve (estados, diferencias)"""
+    seen = set()
+    problems = []
+    stack = [(TicTacToeBoard(), ListBoard(), first)]
+    while stack:
+        board, reference, player = stack.pop()
+        key = (tuple(reference.grid), player)
+        if key in seen:
+            continue
+        seen.add(key)
+        problems.extend(f"{reference.grid} {player.name}: {problem}" for problem in compare(board, reference))
+        if reference.check_win() != "":
+            continue
+        for position in reference.get_legal_positions():
+            move = GameMove(player, position)
+            next_board, next_reference = board.copy(), reference.copy()
+            next_board.make_move(move)
+            next_reference.make_move(move)
+            stack.append((next_board, next_reference, get_other_player(player)))
+    return seen, problems
+
+def main():
+    states = set()
+    problems = []
+    for first in Player:
+        seen, found = walk(first)
+        states |= seen
+        problems.extend(found)
+    print(f"Estados comparados: {len(states)}")
+    for problem in problems[:20]:
+        print(f"  {problem}")
+    if problems:
+        print(f"Diferencias: {len(problems)}")
+        sys.exit(1)
+    print("Sin diferencias")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Suite de benchmarks de los caminos críticos de MCTS.
+
+Mide el tablero (check_win, get_legal_positions, copy), una iteración de MCTS,
+run_search con varios presupuestos y el árbol (insert, remove, copy) con varios
+tamaños, sobre posiciones fijas y semillas fijas. Los resultados se guardan en
+JSON; con --compare se marcan las regresiones respecto a una línea base.
+
+Uso:
+    python -m benchmarks.suite --output resultados.json
+    python -m benchmarks.suite --compare base.json [--threshold 0.10]
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from benchmarks.bench_tree import build_tree
+from mcts import MCTS
+from tree import Tree
+from triqui import TicTacToeBoard, GameMove, Player
+
+# Posiciones de inicio: jugadas alternadas empezando por el humano
+POSITIONS = {
+    "vacio": [],
+    "medio": [0, 4, 8],
+    "final": [0, 4, 8, 2, 6, 3],
+}
+
+SEARCH_BUDGETS = (100, 500, 1000)
+TREE_SIZES = (1_000, 10_000, 100_000)
+
+def build_board(moves):
+    board = TicTacToeBoard()
+    player = Player.HUMAN
+    for position in moves:
+        board.make_move(GameMove(player, position))
+        player = Player.MACHINE if player == Player.HUMAN else Player.HUMAN
+    return board, player
+
+def measure(function, ops, repeat):
+    """Mejor tiempo por operación (s) de `repeat` ejecuciones; `function` hace `ops` operaciones"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best / ops
+
+def bench_board(results, repeat, ops=100_000):
+    for name, moves in POSITIONS.items():
+        board, _ = build_board(moves)
+
+        def check_win():
+            for _ in range(ops):
+                board.check_win()
+
+        def get_legal_positions():
+            for _ in range(ops):
+                board.get_legal_positions()
+
+        def copy():
+            for _ in range(ops):
+                board.copy()
+
+        for function in (check_win, get_legal_positions, copy):
+            results[f"board.{function.__name__}[{name}]"] = measure(function, ops, repeat)
+
+def bench_iteration(results, repeat, ops=2_000):
+    for name, moves in POSITIONS.items():
+        board, player = build_board(moves)
+
+        def run():
+            random.seed(0)
+            mcts = MCTS(board.copy(), player)
+            for _ in range(ops):
+                mcts.run_search_iteration()
+
+        results[f"mcts.run_search_iteration[{name}]"] = measure(run, ops, repeat)
+
+def bench_search(results, repeat):
+    for name, moves in POSITIONS.items():
+        board, player = build_board(moves)
+        for iterations in SEARCH_BUDGETS:
+            def run():
+                random.seed(0)
+                MCTS(board.copy(), player).run_search(iterations=iterations)
+
+            results[f"mcts.run_search[{name},{iterations}]"] = measure(run, 1, repeat)
+
+        def run_solver():
+            random.seed(0)
+            MCTS(board.copy(), player, solver=True).run_search(iterations=SEARCH_BUDGETS[-1])
+
+        results[f"mcts.run_search[{name},{SEARCH_BUDGETS[-1]},solver]"] = measure(run_solver, 1, repeat)
+
+def bench_tree(results, repeat):
+    for size in TREE_SIZES:
+        tree = build_tree(Tree, size)
+        results[f"tree.insert[{size}]"] = measure(lambda: build_tree(Tree, size), size, repeat)
+        results[f"tree.copy[{size}]"] = measure(tree.copy, 1, repeat)
+
+        # Se quita el primer hijo de la raíz de una copia nueva en cada repetición
+        best = float("inf")
+        for _ in range(repeat):
+            victim = tree.copy()
+            child = victim.get_children(victim.get(0))[0]
+            start = time.perf_counter()
+            victim.remove(child)
+            best = min(best, time.perf_counter() - start)
+        results[f"tree.remove[{size}]"] = best
+
+def run_suite(repeat):
+    results = {}
+    bench_board(results, repeat)
+    bench_iteration(results, repeat)
+    bench_search(results, repeat)
+    bench_tree(results, repeat)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "unit": "seconds_per_op",
+        "results": results,
+    }
+
+def compare(current, baseline, threshold):
+    """Devuelve la lista de regresiones (nombre, base, actual, cambio relativo)"""
+    regressions = []
+    print(f"{'Benchmark':<42} | {'Base':>12} | {'Actual':>12} | {'Cambio':>8}")
+    print("-" * 84)
+    for name, value in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<42} | {'-':>12} | {value:12.3e} | {'nuevo':>8}")
+            continue
+        change = (value - base) / base if base else 0.0
+        mark = " <- REGRESIÓN" if change > threshold else ""
+        print(f"{name:<42} | {base:12.3e} | {value:12.3e} | {change * 100:+7.1f}%{mark}")
+        if change > threshold:
+            regressions.append((name, base, value, change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--compare", help="archivo JSON de línea base contra el cual comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="aumento relativo de tiempo a partir del cual se marca regresión (0.10 = 10%%)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    current = run_suite(args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresiones por encima de {args.threshold * 100:.0f}%")
+            sys.exit(1)
+        print("\nSin regresiones")
+    elif not args.output:
+        json.dump(current, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Recorrido y exportación del árbol de búsqueda.
+
+`walk_tree` recorre el árbol en profundidad con una pila explícita y va
+entregando los nodos uno a uno, con cortes por profundidad, visitas mínimas y
+los k hijos más visitados de cada nodo. La memoria extra depende solo de la
+profundidad y de la cantidad de hijos, no del tamaño del árbol, así que sirve
+para volcar árboles de millones de nodos en JSONL o en DOT (Graphviz).
+
+Uso: python export.py arbol.snap [--format jsonl|dot] [--max-depth N] [--min-visits N] [--top-k N]
+"""
+
+import argparse
+import heapq
+import json
+import sys
+
+from triqui import ICONS
+
+def _visits(node):
+    return node.data.simulations
+
+def walk_tree(tree, max_depth=None, min_visits=0, top_k=None, ordered=False):
+    """Genera pares (nodo, profundidad) en preorden desde la raíz.
+
+    No baja más allá de `max_depth`, descarta los subárboles con menos de `min_visits`
+    visitas y de cada nodo sigue solo sus `top_k` hijos más visitados. Con `ordered`
+    los hijos salen de más a menos visitados (con `top_k` siempre salen así).
+
+    Solo recorre árboles: en el modo transposiciones un nodo puede tener varios padres,
+    y al llegar a uno por un padre que no es el suyo se lanza ValueError.
+    """
+    # Para instantáneas con mmap se leen los hijos sin guardarlos en el caché del árbol
+    get_children = getattr(tree, "peek_children", tree.get_children)
+
+    root = tree.get(0)
+    yield root, 0
+    stack = []
+    if max_depth is None or max_depth > 0:
+        stack.append((iter(_select_children(get_children(root), min_visits, top_k, ordered)), 1, root.id))
+    while stack:
+        children, depth, parent_id = stack[-1]
+        node = next(children, None)
+        if node is None:
+            stack.pop()
+            continue
+        if node.parent_id != parent_id:
+            raise ValueError(f"El nodo {node.id} tiene varios padres (modo transposiciones): no es un árbol")
+        yield node, depth
+        if max_depth is None or depth < max_depth:
+            stack.append((iter(_select_children(get_children(node), min_visits, top_k, ordered)), depth + 1, node.id))
+
+def _select_children(children, min_visits, top_k, ordered):
+    if min_visits:
+        children = [child for child in children if child.data.simulations >= min_visits]
+    if top_k is not None:
+        return heapq.nlargest(top_k, children, key=_visits)
+    if ordered:
+        return sorted(children, key=_visits, reverse=True)
+    return children
+
+def node_record(node, depth):
+    data = node.data
+    move = data.move
+    return {
+        "id": node.id,
+        "parent": node.parent_id if depth > 0 else None,
+        "depth": depth,
+        "position": move.position,
+        "player": ICONS[move.player],
+        "visits": data.simulations,
+        "value": data.value,
+        "proof": data.proof,
+    }
+
+def write_jsonl(tree, output, **cutoffs):
+    """Escribe un nodo por línea en JSON; devuelve la cantidad de nodos escritos"""
+    count = 0
+    for node, depth in walk_tree(tree, **cutoffs):
+        output.write(json.dumps(node_record(node, depth)) + "\n")
+        count += 1
+    return count
+
+def write_dot(tree, output, **cutoffs):
+    """Escribe el árbol en formato DOT de Graphviz; devuelve la cantidad de nodos escritos"""
+    count = 0
+    output.write("digraph mcts {\n  node [shape=box, fontname=\"monospace\"];\n")
+    for node, depth in walk_tree(tree, **cutoffs):
+        data = node.data
+        visits = data.simulations
+        mean = data.value / visits if visits else 0.0
+        if depth == 0:
+            label = f"raíz\\n{visits} visitas"
+        else:
+            label = f"{ICONS[data.move.player]} {data.move.position}\\n{visits} visitas, {mean:+.2f}"
+        output.write(f"  n{node.id} [label=\"{label}\"];\n")
+        if depth > 0:
+            output.write(f"  n{node.parent_id} -> n{node.id};\n")
+        count += 1
+    output.write("}\n")
+    return count
+
+WRITERS = {"jsonl": write_jsonl, "dot": write_dot}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("snapshot", help="instantánea guardada con MCTS.save")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("--output", help="archivo de salida (por defecto, la salida estándar)")
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--min-visits", type=int, default=0)
+    parser.add_argument("--top-k", type=int, default=None)
+    args = parser.parse_args()
+
+    # mcts usa `walk_tree`, por eso se importa aquí
+    from mcts import MCTS
+    mcts = MCTS.load(args.snapshot)
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        count = WRITERS[args.format](mcts.tree, output, max_depth=args.max_depth,
+                                     min_visits=args.min_visits, top_k=args.top_k)
+    finally:
+        if args.output:
+            output.close()
+    print(f"Nodos exportados: {count}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
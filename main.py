@@ -4,13 +4,17 @@ Juego de Triqui (Tic-Tac-Toe) con MCTS
 Juega contra la computadora que usa Monte Carlo Tree Search
 """
 
-from triqui import TicTacToeBoard, Player
+from triqui import TicTacToeBoard, GameMove, Player
 from mcts import MCTS
 
+# Visitas de la raíz con las que la máquina decide su jugada
+MACHINE_ITERATIONS = 1000
+
 class TriquiGame:
     def __init__(self):
         self.board = TicTacToeBoard()
-        self.mcts = MCTS(self.board, Player.MACHINE)
+        # El humano mueve primero: la raíz del árbol es su turno
+        self.mcts = MCTS(self.board.copy(), Player.HUMAN)
         self.game_over = False
 
     def print_instructions(self):
@@ -19,7 +23,7 @@ class TriquiGame:
         print("="*50)
         print("\nInstrucciones:")
         print("- Tú eres X, MCTS es O")
-        print("- Ingresa el número de la posición donde quieres jugar (0-8)")
+        print(f"- Ingresa el número de la posición donde quieres jugar (0-{self.board.cells - 1})")
         print("- Las posiciones están numeradas así:")
         print("\n 0 | 1 | 2 ")
         print("___|___|___")
@@ -46,33 +50,35 @@ class TriquiGame:
             try:
                 self.board.print_board()
                 print(f"\nPosiciones disponibles: {self.board.get_legal_positions()}")
-                move = input("Ingresa tu movimiento (0-8): ").strip()
+                move = input(f"Ingresa tu movimiento (0-{self.board.cells - 1}): ").strip()
                 
                 if move.lower() == 'q':
                     return None
                 
                 move = int(move)
-                if 0 <= move <= 8:
+                if 0 <= move < self.board.cells:
                     if self.board.human_make_move(move):
                         return move
                     else:
                         print("¡Esa posición ya está ocupada!")
                 else:
-                    print("¡Por favor ingresa un número entre 0 y 8!")
+                    print(f"¡Por favor ingresa un número entre 0 y {self.board.cells - 1}!")
             except ValueError:
                 print("¡Por favor ingresa un número válido!")
 
     def make_machine_move(self, show_analysis=False):
         # print("\nLa máquina está pensando...")
         
-        # MCTS para el estado actual
-        current_mcts = MCTS(self.board.copy(), Player.MACHINE)
-        result = current_mcts.run_search(iterations=1000, show_progress=show_analysis)
+        # MCTS reutiliza el subárbol de las jugadas anteriores y lo pensado durante el turno humano
+        root_visits = self.mcts.tree.get(0).data.simulations
+        iterations = max(MACHINE_ITERATIONS - root_visits, 0)
+        result = self.mcts.run_search(iterations=iterations, show_progress=show_analysis)
         
         if result and result["move"]:
             move = result["move"]
             print(f"MCTS juega en la posición {move.position}")
             self.board.make_move(move)
+            self.mcts.advance(move)
             return True
         
         return False
@@ -111,11 +117,14 @@ class TriquiGame:
                 print("Por favor responde 's' para sí o 'n' para no.")
         
         while not self.game_over:
-            # Turno del humano
+            # Turno del humano: MCTS sigue pensando mientras espera la jugada
+            self.mcts.start_pondering()
             human_move = self.get_human_move()
+            self.mcts.stop_pondering()
             if human_move is None:
                 print("¡Gracias por jugar!")
                 return
+            self.mcts.advance(GameMove(Player.HUMAN, human_move))
             
             # Verificar si el juego terminó después del movimiento humano
             if self.check_game_over():
@@ -1,20 +1,43 @@
 import math
+import os
 import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from batch_rollout import batch_rollout, make_rng
+from export import walk_tree
+from policies import RandomPolicy
+from snapshot import load_tree, save_tree
+from stats import PHASES, SearchStats
 from tree import Tree, Node
-from triqui import GameMove, Player, get_other_player
+from triqui import TicTacToeBoard, GameMove, Player, ICONS, get_other_player
 
 class GameNode:
     def __init__(self, move):
         self.move = move
         self.value = 0
         self.simulations = 0
+        # Resultado demostrado para quien hizo `move` (WIN, DRAW o LOSS), o None
+        self.proof = None
+        # Estadísticas AMAF (modo RAVE): simulaciones en las que `move` se jugó más adelante
+        self.amaf_value = 0
+        self.amaf_simulations = 0
+        # Búsquedas en curso que pasan por este nodo (búsqueda con hilos)
+        self.virtual_loss = 0
 
     def copy(self):
         new_game_node = GameNode(self.move.copy() if self.move else None)
         new_game_node.value = self.value
         new_game_node.simulations = self.simulations
+        new_game_node.proof = self.proof
+        new_game_node.amaf_value = self.amaf_value
+        new_game_node.amaf_simulations = self.amaf_simulations
         return new_game_node
 
+# Resultados demostrados por el solver
+WIN, DRAW, LOSS = 1, 0, -1
+
 def ucb1(node, parent):
     if node.data.simulations == 0:
         return float('inf')
@@ -23,74 +46,682 @@ def ucb1(node, parent):
     exploration = math.sqrt(2 * math.log(parent.data.simulations) / node.data.simulations)
     return exploitation + exploration
 
+def rave_value(data, k):
+    """Valor del nodo mezclado con su valor AMAF, con peso beta = sqrt(k / (3n + k))"""
+    value = data.value / data.simulations
+    if data.amaf_simulations == 0:
+        return value
+    beta = math.sqrt(k / (3 * data.simulations + k))
+    return (1 - beta) * value + beta * data.amaf_value / data.amaf_simulations
+
+def virtual_loss_ucb1(node, parent):
+    """UCB1 contando cada búsqueda en curso por el nodo como una visita perdida"""
+    data = node.data
+    visits = data.simulations + data.virtual_loss
+    if visits == 0:
+        return float('inf')
+
+    exploitation = (data.value - data.virtual_loss) / visits
+    exploration = math.sqrt(2 * math.log(parent.data.simulations + parent.data.virtual_loss) / visits)
+    return exploitation + exploration
+
+def rave_ucb1(node, parent, k):
+    if node.data.simulations == 0:
+        return float('inf')
+
+    exploration = math.sqrt(2 * math.log(parent.data.simulations) / node.data.simulations)
+    return rave_value(node.data, k) + exploration
+
+# Cada cuántas iteraciones se revisa si la búsqueda ya está decidida
+EARLY_STOP_INTERVAL = 16
+
+# Con presupuesto de nodos, iteraciones seguidas sin nodos nuevos tras las que se deja de
+# buscar: el árbol ya no puede crecer (p. ej. contiene todas las posiciones alcanzables)
+NODE_BUDGET_STALL = 1000
+
+# Tope de iteraciones al pensar en segundo plano, para no crecer sin límite si el rival tarda
+PONDER_MAX_ITERATIONS = 200_000
+
+# Fracción de `max_nodes` que se libera cada vez que se llena el árbol
+EVICTION_FRACTION = 0.1
+
+def gil_enabled():
+    """False solo en las versiones de CPython sin GIL (free-threaded) con el GIL desactivado"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+# Visitas con las que el valor AMAF y el valor propio de un nodo pesan lo mismo en RAVE
+RAVE_K = 100
+
 class MCTS:
-    def __init__(self, model, player=Player.MACHINE):
+    def __init__(self, model, player=Player.MACHINE, tree_class=Tree, transpositions=False, batch_size=0,
+                 instrument=False, solver=False, in_place=False, max_nodes=None, rave=False, rave_k=RAVE_K,
+                 rollout_policy=None):
         self.model = model
+        self.tree_class = tree_class
         root = Node(GameNode(GameMove(get_other_player(player), None)))
-        self.tree = Tree(root)
+        self.tree = tree_class(root)
+
+        # Simulaciones por lotes (NumPy): `batch_size` partidas aleatorias por hoja
+        self.batch_size = batch_size
+        self.batch_rng = make_rng(random.getrandbits(64)) if batch_size else None
+
+        # MCTS-Solver: marca resultados exactos y deja de simular los subárboles resueltos
+        self.solver = solver
+
+        # Instrumentación opcional: se crea un SearchStats nuevo en cada run_search
+        self.instrument = instrument
+        self.stats = None
+
+        # Búsqueda en segundo plano mientras piensa el rival
+        self.ponder_thread = None
+        self.ponder_stop = None
+
+        # Iteraciones sin copias: las jugadas se aplican sobre `model` y se deshacen al final
+        self.in_place = in_place
+        self.move_stack = [0] * model.cells
+        if in_place and (transpositions or batch_size):
+            raise ValueError("El modo in_place no admite transposiciones ni simulaciones por lotes")
+
+        # Memoria acotada: al llegar a `max_nodes` se liberan los subárboles menos visitados
+        self.max_nodes = max_nodes
+        if max_nodes is not None and transpositions:
+            raise ValueError("max_nodes no admite el modo transposiciones")
+        # La raíz y sus hijos nunca se liberan: el tope tiene que dejar sitio para algo más
+        if max_nodes is not None and max_nodes <= model.cells + 1:
+            raise ValueError(f"max_nodes debe ser mayor que {model.cells + 1} (la raíz y sus hijos)")
+
+        # RAVE: cada simulación actualiza también las estadísticas AMAF de los hermanos
+        self.rave = rave
+        self.rave_k = rave_k
+        if rave and (transpositions or batch_size):
+            raise ValueError("El modo RAVE no admite transposiciones ni simulaciones por lotes")
+
+        # Política de simulación: elige cada jugada de los rollouts (ver policies.py)
+        self.rollout_policy = rollout_policy if rollout_policy is not None else RandomPolicy()
+        if batch_size and not isinstance(self.rollout_policy, RandomPolicy):
+            raise ValueError("Las simulaciones por lotes solo admiten la política aleatoria")
+
+        # Lotes, transposiciones y la heurística usan las máscaras del tablero de 3×3
+        if not isinstance(model, TicTacToeBoard) and (
+                batch_size or transpositions or not isinstance(self.rollout_policy, RandomPolicy)):
+            raise ValueError("Las simulaciones por lotes, las transposiciones y las políticas no aleatorias "
+                             "necesitan un tablero de 3×3 (TicTacToeBoard)")
+
+        # Búsqueda con hilos sobre el mismo árbol: el lock protege expand y la retropropagación.
+        # Solo existe durante `run_threaded_search`, para que el MCTS se pueda serializar
+        self.tree_lock = None
+        self.threaded = False
+
+        # Modo transposiciones: clave canónica de la posición -> id del nodo
+        self.transpositions = None
+        if transpositions:
+            if tree_class is not Tree:
+                raise ValueError("El modo transposiciones necesita el árbol de nodos (Tree)")
+            self.transpositions = {model.canonical_key(): 0}
+
+    def run_search(self, iterations=None, show_progress=False, time_limit_ms=None, node_budget=None):
+        """Busca hasta agotar el presupuesto de iteraciones, tiempo (ms) o nodos nuevos.
+
+        Sin ningún presupuesto se hacen 50 iteraciones. La búsqueda termina antes si solo
+        hay una jugada legal, si el hijo más visitado ya no puede ser alcanzado o, con
+        presupuesto de nodos, si el árbol deja de crecer.
+        """
+        if iterations is None and time_limit_ms is None and node_budget is None:
+            iterations = 50
+        if node_budget is not None and self.max_nodes is not None:
+            raise ValueError("node_budget no admite max_nodes: la liberación de nodos falsea la cuenta")
+
+        if self.instrument:
+            self.stats = SearchStats()
+
+        legal_positions = self.model.get_legal_positions()
+        if len(legal_positions) == 1 and self.model.check_win() == "":
+            player = get_other_player(self.tree.get(0).data.move.player)
+            result = {"move": GameMove(player, legal_positions[0]), "iterations": 0}
+            if self.stats is not None:
+                result["stats"] = self.stats
+            return result
 
-    def run_search(self, iterations=50, show_progress=False):
         if show_progress:
-            print(f"\nMCTS está pensando... ({iterations} iteraciones)")
+            if iterations is not None:
+                budget = f"{iterations} iteraciones"
+            elif time_limit_ms is not None:
+                budget = f"{time_limit_ms} ms"
+            else:
+                budget = f"{node_budget} nodos"
+            print(f"\nMCTS está pensando... ({budget})")
             print("=" * 50)
 
-        for i in range(iterations):
+        start = time.perf_counter()
+        deadline = start + time_limit_ms / 1000 if time_limit_ms is not None else None
+
+        done = 0
+        allocated = 0
+        stalled = 0
+        while (iterations is None or done < iterations) and not self.is_solved():
+            size = len(self.tree)
             self.run_search_iteration()
-            
+            done += 1
+
+            if node_budget is not None:
+                # Nodos creados por esta iteración, no el tamaño del árbol
+                new_nodes = len(self.tree) - size
+                allocated += new_nodes
+                stalled = 0 if new_nodes else stalled + 1
+                if allocated >= node_budget or stalled >= NODE_BUDGET_STALL:
+                    break
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+            if done % EARLY_STOP_INTERVAL == 0:
+                remaining = self.get_remaining_iterations(iterations, done, start, time.perf_counter(), deadline)
+                if self.is_decided(remaining):
+                    break
+
             # Mostrar progreso cada 200 iteraciones
-            if show_progress and (i + 1) % 200 == 0:
-                progress = (i + 1) / iterations * 100
-                # print(f"Progreso: {progress:.0f}% ({i + 1}/{iterations})")
+            if show_progress and done % 200 == 0:
+                if iterations is not None:
+                    progress = done / iterations * 100
+                elif time_limit_ms is not None:
+                    progress = (time.perf_counter() - start) / (time_limit_ms / 1000) * 100
+                else:
+                    progress = allocated / node_budget * 100
+                print(f"Progreso: {min(progress, 100):.0f}% ({done} iteraciones)")
+
+        if self.stats is not None:
+            self.stats.elapsed = time.perf_counter() - start
 
-        children = self.tree.get_children(self.tree.get(0))
+        result = self.get_search_result(show_progress)
+        if result:
+            result["iterations"] = done
+            if self.stats is not None:
+                result["stats"] = self.stats
+        return result
+
+    def get_remaining_iterations(self, iterations, done, start, now, deadline):
+        """Cota de las iteraciones que quedan según el presupuesto más estricto; None si no hay cota"""
+        remaining = []
+        if iterations is not None:
+            remaining.append(iterations - done)
+        if deadline is not None:
+            rate = done / max(now - start, 1e-9)
+            remaining.append(rate * (deadline - now))
+        return min(remaining) if remaining else None
+
+    def is_decided(self, remaining):
+        """True si el hijo más visitado de la raíz no puede ser superado en `remaining` iteraciones"""
+        if remaining is None:
+            return False
+        visits = sorted((child.data.simulations for _, child in self.get_root_children()), reverse=True)
+        if len(visits) < 2:
+            return False
+        # Con simulaciones por lotes cada iteración suma `batch_size` visitas
+        return visits[0] - visits[1] > remaining * max(self.batch_size, 1)
+
+    def get_search_result(self, show_progress=False):
+        children = self.get_root_children()
         if not children:
             # If there are not children, make a random move
             legal_moves = self.model.get_legal_positions()
             if legal_moves:
-                best_move = GameMove(Player.MACHINE, random.choice(legal_moves))
+                player = get_other_player(self.tree.get(0).data.move.player)
+                best_move = GameMove(player, random.choice(legal_moves))
                 return {"move": best_move}
             return None
 
-        best_move_node = max(children, key=lambda x: x.data.simulations)
+        if self.solver:
+            # Una jugada ganadora demostrada primero; nunca una perdedora si hay alternativa
+            winning = [child for child in children if child[1].data.proof == WIN]
+            safe = [child for child in children if child[1].data.proof != LOSS]
+            children = winning or safe or children
+
+        best_position, best_move_node = max(children, key=lambda x: x[1].data.simulations)
         
         if show_progress:
             self.print_search_results()
         
-        return {"move": best_move_node.data.move}
+        return {"move": GameMove(best_move_node.data.move.player, best_position)}
+
+    def run_parallel_search(self, workers=4, iterations=1000, time_limit_ms=None, seed=None,
+                            show_progress=False, executor=None):
+        """Búsqueda paralela en la raíz: cada proceso hace una búsqueda independiente.
+
+        Cada trabajador corre `iterations` iteraciones (o hasta `time_limit_ms`) con su
+        propia semilla; las estadísticas de los hijos de la raíz se suman antes de elegir.
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        player = get_other_player(self.tree.get(0).data.move.player)
+        args = (self.model.copy(), player, iterations, time_limit_ms, self.transpositions is not None)
+
+        if executor is None:
+            with ProcessPoolExecutor(workers) as pool:
+                futures = [pool.submit(_root_search_worker, *args, seed + i) for i in range(workers)]
+                results = [future.result() for future in futures]
+        else:
+            futures = [executor.submit(_root_search_worker, *args, seed + i) for i in range(workers)]
+            results = [future.result() for future in futures]
+
+        for children, _ in results:
+            self.merge_root_statistics(children)
+
+        result = self.get_search_result(show_progress)
+        if result:
+            result["iterations"] = sum(done for _, done in results)
+        return result
+
+    def run_threaded_search(self, threads=None, iterations=1000, time_limit_ms=None, show_progress=False):
+        """Búsqueda paralela en el árbol: varios hilos comparten este mismo árbol.
+
+        Cada hilo selecciona sin lock, expande y retropropaga con `tree_lock` tomado y
+        simula sin lock; la pérdida virtual aparta a los hilos de los caminos en curso.
+        Solo acelera en CPython sin GIL; por defecto usa un hilo si el GIL está activo.
+        """
+        if (self.in_place or self.transpositions is not None or self.batch_size or self.rave
+                or self.max_nodes is not None or self.tree_class is not Tree):
+            raise ValueError("La búsqueda con hilos necesita el árbol de nodos (Tree) y el modo de copias, "
+                             "sin transposiciones, lotes, RAVE ni max_nodes")
+        if threads is None:
+            threads = 1 if gil_enabled() else os.cpu_count() or 1
+        if threads < 1:
+            raise ValueError(f"Se necesita al menos un hilo: {threads}")
+        if threads == 1:
+            result = self.run_search(iterations=iterations, time_limit_ms=time_limit_ms, show_progress=show_progress)
+            if result:
+                result["threads"] = 1
+            return result
+
+        deadline = time.perf_counter() + time_limit_ms / 1000 if time_limit_ms is not None else None
+        budget_lock = threading.Lock()
+        done = 0
+
+        def worker():
+            nonlocal done
+            while not self.is_solved():
+                with budget_lock:
+                    if iterations is not None and done >= iterations:
+                        return
+                    done += 1
+                self.run_search_iteration_threaded()
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+
+        self.tree_lock = threading.Lock()
+        self.threaded = True
+        try:
+            workers = [threading.Thread(target=worker) for _ in range(threads)]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+        finally:
+            self.threaded = False
+            self.tree_lock = None
+
+        result = self.get_search_result(show_progress)
+        if result:
+            result["iterations"] = done
+            result["threads"] = threads
+        return result
+
+    def run_search_iteration_threaded(self):
+        """Una iteración de `run_threaded_search`, segura frente a otros hilos"""
+        select_res = self.select(self.model.copy())
+        model = select_res["model"]
+
+        with self.tree_lock:
+            # Otro hilo pudo expandir la hoja después de seleccionarla: expand vuelve a
+            # mirar las jugadas sin hijo con el lock tomado, así que no se duplican hijos
+            leaf = self.expand(select_res["node"], model)["node"]
+            path = list(self.iter_ancestors(leaf))
+            if self.solver and leaf.data.proof is not None:
+                self.backpropagate(leaf, self.get_proven_winner(leaf))
+                self.propagate_proof(leaf)
+                return
+            for node in path:
+                node.data.virtual_loss += 1
+
+        winner = self.simulate(leaf, model)["winner_icon"]
+
+        with self.tree_lock:
+            for node in path:
+                node.data.virtual_loss -= 1
+            self.backpropagate(leaf, winner)
+
+    def merge_root_statistics(self, children):
+        """Suma a los hijos de la raíz las estadísticas {posición: (simulaciones, valor)}"""
+        root = self.tree.get(0)
+        player = get_other_player(root.data.move.player)
+        existing = dict(self.get_root_children())
+
+        for position, (simulations, value) in children.items():
+            move = GameMove(player, position)
+            if self.transpositions is not None:
+                child_id = self.transpositions.get(self.model.canonical_key_after(move))
+                child = self.tree.get(child_id) if child_id is not None else None
+            else:
+                child = existing.get(position)
+
+            if child is None:
+                child = self.tree.insert(Node(GameNode(move)), root)
+                if self.transpositions is not None:
+                    self.transpositions[self.model.canonical_key_after(move)] = child.id
+
+            child.data.simulations += simulations
+            child.data.value += value
+            root.data.simulations += simulations
+
+    def is_solved(self):
+        return self.solver and self.tree.get(0).data.proof is not None
+
+    def get_root_children(self):
+        """Hijos de la raíz como pares (posición, nodo), con la posición vista desde el tablero actual"""
+        root = self.tree.get(0)
+        if self.transpositions is not None:
+            return self.get_transposed_children(root, self.model)
+        return [(child.data.move.position, child) for child in self.tree.get_children(root)]
+
+    def start_pondering(self, max_iterations=PONDER_MAX_ITERATIONS):
+        """Sigue buscando sobre la posición actual en un hilo aparte (p. ej. mientras el humano piensa).
+
+        Hay que llamar a `stop_pondering` antes de usar el árbol o avanzar la raíz.
+        """
+        if self.ponder_thread is not None:
+            return
+        self.ponder_stop = threading.Event()
+        self.ponder_thread = threading.Thread(target=self.ponder, args=(self.ponder_stop, max_iterations), daemon=True)
+        self.ponder_thread.start()
+
+    def ponder(self, stop, max_iterations):
+        done = 0
+        while done < max_iterations and not stop.is_set() and not self.is_solved():
+            self.run_search_iteration()
+            done += 1
+
+    def stop_pondering(self):
+        """Detiene la búsqueda en segundo plano y espera a que termine la iteración en curso"""
+        if self.ponder_thread is None:
+            return
+        self.ponder_stop.set()
+        self.ponder_thread.join()
+        self.ponder_thread = None
+        self.ponder_stop = None
+
+    def advance(self, move):
+        """Avanza la raíz tras una jugada real, conservando el subárbol que le corresponde"""
+        for position, child in self.get_root_children():
+            if position == move.position and child.data.move.player == move.player:
+                new_ids = self.tree.reroot(child)
+                break
+        else:
+            new_ids = {}
+            self.tree = self.tree_class(Node(GameNode(move.copy())))
+
+        self.model.make_move(move)
+
+        if self.transpositions is not None:
+            self.transpositions = {key: new_ids[id] for key, id in self.transpositions.items() if id in new_ids}
+            self.transpositions[self.model.canonical_key()] = 0
+
+    def save(self, path):
+        """Guarda el árbol y el tablero de la raíz en una instantánea binaria (ver snapshot.py)"""
+        if self.transpositions is not None:
+            raise ValueError("Las instantáneas no admiten el modo transposiciones")
+        if not isinstance(self.model, TicTacToeBoard):
+            raise ValueError("Las instantáneas solo admiten el tablero de Triqui")
+        return save_tree(path, self.tree, self.model)
+
+    @classmethod
+    def load(cls, path, **options):
+        """Crea un MCTS a partir de una instantánea; los nodos se leen del archivo a medida que se usan"""
+        if options.get("transpositions"):
+            raise ValueError("Las instantáneas no admiten el modo transposiciones")
+        tree, cells, human, machine = load_tree(path, GameNode)
+        model = TicTacToeBoard()
+        if cells != model.cells:
+            raise ValueError(f"La instantánea es de un tablero de {cells} casillas")
+        model.set_masks(human, machine)
+        mcts = cls(model, get_other_player(tree.get(0).data.move.player), **options)
+        mcts.tree = tree
+        return mcts
 
     def run_search_iteration(self):
+        if self.max_nodes is not None and len(self.tree) >= self.max_nodes:
+            self.evict_nodes()
+        if self.in_place:
+            return self.run_search_iteration_in_place()
+
+        stats = self.stats
+        # Instante de inicio solo en las iteraciones que se miden
+        timer = stats.start_iteration() if stats is not None else None
+
         select_res = self.select(self.model.copy())
         select_leaf = select_res["node"]
         select_model = select_res["model"]
+        path = select_res["path"]
+        if timer: timer = stats.lap("select", timer)
 
-        expand_res = self.expand(select_leaf, select_model)
+        expand_res = self.expand(select_leaf, select_model, path)
         expand_leaf = expand_res["node"]
         expand_model = expand_res["model"]
+        if timer: timer = stats.lap("expand", timer)
+
+        new_node = expand_leaf is not select_leaf
+        depth = select_res["depth"] + new_node
+
+        if self.solver and expand_leaf.data.proof is not None:
+            # Hoja resuelta: su resultado es exacto, no hace falta simular
+            self.backpropagate(expand_leaf, self.get_proven_winner(expand_leaf), path)
+            self.propagate_proof(expand_leaf, path)
+            if timer: stats.lap("backpropagate", timer)
+            if stats is not None: stats.record_iteration(depth, new_node)
+            return
+
+        if self.batch_size:
+            player = get_other_player(expand_leaf.data.move.player)
+            counts = batch_rollout(expand_model, player, self.batch_size, self.batch_rng)
+            if timer: timer = stats.lap("simulate", timer)
+            self.backpropagate_counts(expand_leaf, counts, path)
+            if timer: stats.lap("backpropagate", timer)
+            if stats is not None: stats.record_iteration(depth, new_node)
+            return
 
         simulation = self.simulate(expand_leaf, expand_model)
+        if timer: timer = stats.lap("simulate", timer)
 
-        self.backpropagate(expand_leaf, simulation["winner_icon"])
+        if self.rave:
+            self.backpropagate_rave(expand_leaf, simulation["winner_icon"], simulation["played"])
+        else:
+            self.backpropagate(expand_leaf, simulation["winner_icon"], path)
+        if timer: stats.lap("backpropagate", timer)
+        if stats is not None: stats.record_iteration(depth, new_node, simulation["plies"])
 
-    def get_best_child_ucb1(self, node):
-        children = self.tree.get_children(node)
+    def evict_nodes(self, fraction=EVICTION_FRACTION):
+        """Libera los subárboles menos visitados hasta recuperar `fraction` de `max_nodes`.
+
+        La raíz y sus hijos se conservan siempre: de ellos sale la jugada elegida.
+        """
+        target = max(1, int(self.max_nodes * fraction))
+        root = self.tree.get(0)
+        candidates = [node for node in self.tree.iter_nodes()
+                      if not node.is_root() and node.parent_id != root.id]
+        candidates.sort(key=lambda node: node.data.simulations)
+
+        released = 0
+        for node in candidates:
+            if released >= target:
+                break
+            # Puede que ya se haya liberado junto con un ancestro
+            if not self.tree.contains(node):
+                continue
+            released += self.tree.release(node)
+        return released
+
+    def run_search_iteration_in_place(self):
+        """Iteración sin copiar el tablero ni crear diccionarios.
+
+        Las jugadas se aplican sobre `self.model`, se anotan en `move_stack` y se
+        deshacen al terminar; solo se reserva memoria para el nodo nuevo.
+        """
+        model = self.model
+        stack = self.move_stack
+        depth = 0
+        stats = self.stats
+        timer = stats.start_iteration() if stats is not None else None
+
+        node = self.tree.get(0)
+        while not node.is_leaf() and node.has_n_children(model.empty_count):
+            child = self.select_child_in_place(node)
+            if child is None:
+                break
+            node = child
+            position = node.data.move.position
+            model.play(position, node.data.move.player)
+            stack[depth] = position
+            depth += 1
+        select_depth = depth
+        if timer: timer = stats.lap("select", timer)
+
+        leaf = node
+        if model.check_win() == "" and not (self.solver and node.data.proof is not None):
+            untried = model.empty_count - len(node.children_id)
+            if untried > 0:
+                position = self.pick_untried_position(node, model, random.randrange(untried))
+                player = get_other_player(node.data.move.player)
+                model.play(position, player)
+                stack[depth] = position
+                depth += 1
+                leaf = self.tree.insert(Node(GameNode(GameMove(player, position))), node)
+                if self.solver:
+                    winner = model.check_win()
+                    if winner != "":
+                        leaf.data.proof = DRAW if winner == "v" else WIN
+        if timer: timer = stats.lap("expand", timer)
+
+        plies = None
+        if self.solver and leaf.data.proof is not None:
+            self.backpropagate(leaf, self.get_proven_winner(leaf))
+            self.propagate_proof(leaf)
+        else:
+            player = leaf.data.move.player
+            rollout_start = depth
+            choose = self.rollout_policy.choose
+            winner = model.check_win()
+            while winner == "":
+                player = get_other_player(player)
+                position = choose(model, player)
+                model.play(position, player)
+                stack[depth] = position
+                depth += 1
+                winner = model.check_win()
+            plies = depth - rollout_start
+            if timer: timer = stats.lap("simulate", timer)
+            if self.rave:
+                played = {}
+                player = leaf.data.move.player
+                for i in range(rollout_start, depth):
+                    player = get_other_player(player)
+                    played[stack[i]] = player
+                self.backpropagate_rave(leaf, winner, played)
+            else:
+                self.backpropagate(leaf, winner)
+        if timer: stats.lap("backpropagate", timer)
+
+        if stats is not None:
+            stats.record_iteration(select_depth + (leaf is not node), leaf is not node, plies)
+
+        while depth:
+            depth -= 1
+            model.unplay(stack[depth])
+
+    def select_child_in_place(self, node):
+        """Hijo con mayor UCB1 sin crear listas; None si el solver acaba de resolver `node`"""
+        log_parent = math.log(node.data.simulations) if node.data.simulations else 0.0
+        best = None
+        best_score = -math.inf
+        for child_id in node.children_id:
+            data = self.tree.get(child_id).data
+            if self.solver and data.proof is not None:
+                continue
+            if data.simulations == 0:
+                return self.tree.get(child_id)
+            value = rave_value(data, self.rave_k) if self.rave else data.value / data.simulations
+            score = value + math.sqrt(2 * log_parent / data.simulations)
+            if score > best_score:
+                best = child_id
+                best_score = score
+
+        if best is None:
+            if self.solver:
+                node.data.proof = -max(self.tree.get(child_id).data.proof for child_id in node.children_id)
+            return None
+        return self.tree.get(best)
+
+    def pick_untried_position(self, node, model, k):
+        """La k-ésima jugada legal (en orden) que aún no tiene nodo hijo"""
+        tried = {self.tree.get(child_id).data.move.position for child_id in node.children_id}
+        for position in model.iter_legal_positions():
+            if position not in tried:
+                if k == 0:
+                    return position
+                k -= 1
+        return None
+
+    def get_best_child_ucb1(self, node, children=None):
+        if children is None:
+            children = self.tree.get_children(node)
         if not children:
             return None
         
-        node_scores = [(child, ucb1(child, node)) for child in children]
+        if self.threaded:
+            node_scores = [(child, virtual_loss_ucb1(child, node)) for child in children]
+        elif self.rave:
+            node_scores = [(child, rave_ucb1(child, node, self.rave_k)) for child in children]
+        else:
+            node_scores = [(child, ucb1(child, node)) for child in children]
         return max(node_scores, key=lambda x: x[1])[0]
 
     def select(self, model):
         node = self.tree.get(0)
+        depth = 0
+        # En modo transposiciones un nodo tiene varios padres: se guarda el camino recorrido
+        path = [node] if self.transpositions is not None else None
 
-        while not node.is_leaf() and self.is_fully_explored(node, model):
-            node = self.get_best_child_ucb1(node)
-            if node is None:
-                break
-            model.make_move(node.data.move)
+        # Con transposiciones los hijos se descubren por su clave, aunque aún no estén enlazados
+        while (path is not None or not node.is_leaf()) and self.is_fully_explored(node, model):
+            if path is None:
+                if self.solver:
+                    children = self.get_unproven_children(node, self.tree.get_children(node))
+                    if children is None:
+                        break
+                    node = self.get_best_child_ucb1(node, children)
+                else:
+                    node = self.get_best_child_ucb1(node)
+                if node is None:
+                    break
+                model.make_move(node.data.move)
+                depth += 1
+            else:
+                player = get_other_player(node.data.move.player)
+                positions = {child.id: position for position, child in self.get_transposed_children(node, model)}
+                children = [self.tree.get(id) for id in positions]
+                if self.solver:
+                    children = self.get_unproven_children(node, children)
+                    if children is None:
+                        break
+                child = self.get_best_child_ucb1(node, children)
+                if child is None:
+                    break
+                node = child
+                model.make_move(GameMove(player, positions[node.id]))
+                path.append(node)
+                depth += 1
 
-        return {"node": node, "model": model}
+        return {"node": node, "model": model, "path": path, "depth": depth}
 
-    def expand(self, node, model):
+    def expand(self, node, model, path=None):
         expanded_node = None
 
         if model.check_win() == "":
@@ -102,8 +733,14 @@ class MCTS:
                 random_move = GameMove(other_player, random_pos)
                 model.make_move(random_move)
 
-                expanded_node = Node(GameNode(random_move))
-                self.tree.insert(expanded_node, node)
+                expanded_node = self.tree.insert(Node(GameNode(random_move)), node)
+                if self.solver:
+                    winner = model.check_win()
+                    if winner != "":
+                        expanded_node.data.proof = DRAW if winner == "v" else WIN
+                if path is not None:
+                    self.transpositions[model.canonical_key()] = expanded_node.id
+                    path.append(expanded_node)
             else:
                 expanded_node = node
         else:
@@ -113,18 +750,108 @@ class MCTS:
 
     def simulate(self, node, model): # Rollout
         current_player = node.data.move.player
+        plies = 0
+        # En modo RAVE se anota quién jugó cada casilla
+        played = {} if self.rave else None
+        choose = self.rollout_policy.choose
 
         while model.check_win() == "":
             current_player = get_other_player(current_player)
-            model.make_random_move(current_player)
+            position = choose(model, current_player)
+            model.play(position, current_player)
+            if played is not None:
+                played[position] = current_player
+            plies += 1
 
         winner_icon = model.check_win()
 
         return {
-            "winner_icon": winner_icon
+            "winner_icon": winner_icon,
+            "plies": plies,
+            "played": played
         }
 
-    def backpropagate(self, node, winner):
+    def backpropagate(self, node, winner, path=None):
+        if path is not None:
+            # Modo transposiciones: se actualiza el camino recorrido, no los padres del árbol
+            for path_node in reversed(path):
+                self.update_statistics(path_node, winner)
+            return
+
+        self.update_statistics(node, winner)
+        if not node.is_root():
+            self.backpropagate(self.tree.get_parent(node), winner)
+
+    def backpropagate_rave(self, node, winner, played):
+        """Como backpropagate, y además actualiza AMAF en los hijos de cada ancestro.
+
+        `played` lleva casilla -> jugador de las jugadas de la simulación; al subir se
+        le agregan las del camino. Un hijo cuenta si su jugada aparece con el mismo jugador.
+        """
+        while True:
+            self.update_statistics(node, winner)
+            for child in self.tree.get_children(node):
+                move = child.data.move
+                if played.get(move.position) == move.player:
+                    self.update_amaf(child, winner)
+            if node.is_root():
+                return
+            played[node.data.move.position] = node.data.move.player
+            node = self.tree.get_parent(node)
+
+    def update_amaf(self, node, winner):
+        node.data.amaf_simulations += 1
+        if winner == ICONS[node.data.move.player]:
+            node.data.amaf_value += 1
+        elif winner != "v":
+            node.data.amaf_value -= 1
+
+    def backpropagate_counts(self, node, counts, path=None):
+        """Aplica de una vez el resultado agregado {"h", "m", "v"} de un lote de simulaciones"""
+        nodes = reversed(path) if path is not None else self.iter_ancestors(node)
+        simulations = counts["h"] + counts["m"] + counts["v"]
+        for current in nodes:
+            current.data.simulations += simulations
+            if not current.is_root():
+                if current.data.move.player == Player.MACHINE:
+                    current.data.value += counts["m"] - counts["h"]
+                else:
+                    current.data.value += counts["h"] - counts["m"]
+
+    def iter_ancestors(self, node):
+        """Recorre `node` y sus ancestros hasta la raíz"""
+        yield node
+        while not node.is_root():
+            node = self.tree.get_parent(node)
+            yield node
+
+    def get_unproven_children(self, node, children):
+        """Hijos sin resolver de un nodo ya expandido por completo.
+
+        Si todos están resueltos, `node` queda resuelto por minimax y se devuelve None.
+        """
+        unproven = [child for child in children if child.data.proof is None]
+        if unproven or not children:
+            return unproven
+        node.data.proof = -max(child.data.proof for child in children)
+        return None
+
+    def propagate_proof(self, node, path=None):
+        """Sube una prueba por el camino: si un hijo gana, quien movió hacia el padre pierde"""
+        chain = list(reversed(path)) if path is not None else list(self.iter_ancestors(node))
+        for child, parent in zip(chain, chain[1:]):
+            if child.data.proof != WIN:
+                break
+            parent.data.proof = LOSS
+
+    def get_proven_winner(self, node):
+        """Ícono del ganador ("h", "m" o "v") de un nodo resuelto"""
+        if node.data.proof == DRAW:
+            return "v"
+        player = node.data.move.player
+        return ICONS[player] if node.data.proof == WIN else ICONS[get_other_player(player)]
+
+    def update_statistics(self, node, winner):
         node.data.simulations += 1
         if not node.is_root():
             if ((node.data.move.player == Player.MACHINE and winner == "m") or
@@ -133,45 +860,71 @@ class MCTS:
             if ((node.data.move.player == Player.MACHINE and winner == "h") or
                 (node.data.move.player == Player.HUMAN and winner == "m")):
                 node.data.value -= 1
-        
-            self.backpropagate(self.tree.get_parent(node), winner)
 
     def is_fully_explored(self, node, model):
         return len(self.get_available_plays(node, model)) == 0
 
     def get_available_plays(self, node, model):
-        children = self.tree.get_children(node)
         legal_positions = model.get_legal_positions()
-        
-        explored_positions = [child.data.move.position for child in children if child.data.move]
+
+        if self.transpositions is not None:
+            # Jugadas hacia posiciones nuevas, una sola por cada clase de simetría
+            player = get_other_player(node.data.move.player)
+            keys = set()
+            available = []
+            for pos in legal_positions:
+                key = model.canonical_key_after(GameMove(player, pos))
+                if key not in self.transpositions and key not in keys:
+                    keys.add(key)
+                    available.append(pos)
+            return available
+
+        children = self.tree.get_children(node)
+        explored_positions = {child.data.move.position for child in children if child.data.move}
         return [pos for pos in legal_positions if pos not in explored_positions]
 
+    def get_transposed_children(self, node, model):
+        """Hijos ya conocidos de `node` en modo transposiciones, como pares (posición, nodo).
+
+        Las jugadas que llevan a posiciones simétricas comparten un mismo nodo.
+        """
+        player = get_other_player(node.data.move.player)
+        children = []
+        seen = set()
+        for pos in model.get_legal_positions():
+            child_id = self.transpositions.get(model.canonical_key_after(GameMove(player, pos)))
+            if child_id is not None and child_id not in seen:
+                seen.add(child_id)
+                if child_id not in node.children_id:
+                    node.children_id.append(child_id)
+                children.append((pos, self.tree.get(child_id)))
+        return children
+
     def print_search_results(self):
         """Muestra un resumen visual de la búsqueda MCTS"""
         print("\nRESULTADOS DE LA BÚSQUEDA MCTS")
         print("=" * 50)
         
         root = self.tree.get(0)
-        children = self.tree.get_children(root)
+        children = self.get_root_children()
         
         if not children:
             print("❌ No se encontraron movimientos posibles")
             return
         
-        # print(f"Total de iteraciones: {root.data.simulations}")
-        # print(f"Movimientos evaluados: {len(children)}")
+        if self.stats is not None:
+            self.print_search_stats()
         print()
         
         # Ordenar hijos por número de simulaciones (descendente)
-        sorted_children = sorted(children, key=lambda x: x.data.simulations, reverse=True)
+        sorted_children = sorted(children, key=lambda x: x[1].data.simulations, reverse=True)
         
         print("ANÁLISIS DE MOVIMIENTOS:")
         print("-" * 50)
         print("Pos | Sims | Victorias | Tasa Win | UCB1  | Eval")
         print("-" * 50)
         
-        for i, child in enumerate(sorted_children):
-            pos = child.data.move.position
+        for i, (pos, child) in enumerate(sorted_children):
             sims = child.data.simulations
             wins = child.data.value
             win_rate = (wins / sims * 100) if sims > 0 else 0
@@ -189,41 +942,51 @@ class MCTS:
             
             print(f" {pos}  | {sims:4d} | {wins:8.1f} | {win_rate:7.1f}% | {ucb1_val:5.2f} | {indicator}")
         
-        best_child = sorted_children[0]
+        best_pos, best_child = sorted_children[0]
         print("-" * 50)
-        print(f"DECISIÓN: Jugar en posición {best_child.data.move.position}, simulaciones: {best_child.data.simulations} simulaciones")
+        print(f"DECISIÓN: Jugar en posición {best_pos}, simulaciones: {best_child.data.simulations} simulaciones")
         print(f"Win rate: {(best_child.data.value / best_child.data.simulations * 100):.1f}%")
         print()
 
-    def print_tree_structure(self, max_depth=2):
+    def print_search_stats(self):
+        """Muestra las estadísticas de la última búsqueda (requiere instrument=True)"""
+        stats = self.stats
+        print(f"Iteraciones: {stats.iterations} en {stats.elapsed * 1000:.1f} ms ({stats.iterations_per_second():.0f} iter/s)")
+        print(f"Nodos nuevos: {stats.nodes_allocated} | Profundidad máxima: {stats.max_depth} | "
+              f"Simulación promedio: {stats.average_rollout_length():.1f} jugadas")
+        total = sum(stats.estimated_phase_time(phase) for phase in PHASES) or 1
+        print("Tiempo por fase: " + " | ".join(
+            f"{phase} {stats.estimated_phase_time(phase) * 1000:.1f} ms ({stats.estimated_phase_time(phase) / total * 100:.0f}%)"
+            for phase in PHASES))
+
+    def print_tree_structure(self, max_depth=2, min_visits=0, top_k=None):
         """Muestra la estructura del árbol de búsqueda"""
+        if self.transpositions is not None:
+            raise ValueError("La estructura del árbol no se puede mostrar en el modo transposiciones")
         print("\n🌳 ESTRUCTURA DEL ÁRBOL DE BÚSQUEDA")
         print("=" * 40)
-        
-        def print_node(node, depth=0):
-            if depth > max_depth:
-                return
-            
+
+        # Hijos ordenados por simulaciones
+        for node, depth in walk_tree(self.tree, max_depth, min_visits, top_k, ordered=True):
             indent = "  " * depth
-            
-            if node.is_root():
-                print(f"{indent}🌱 RAÍZ (sims: {node.data.simulations})")
+            sims = node.data.simulations
+            if depth == 0:
+                print(f"{indent}🌱 RAÍZ (sims: {sims})")
             else:
                 pos = node.data.move.position
                 player = "🤖" if node.data.move.player == Player.MACHINE else "👤"
-                sims = node.data.simulations
-                value = node.data.value
-                win_rate = (value / sims * 100) if sims > 0 else 0
-                
+                win_rate = (node.data.value / sims * 100) if sims > 0 else 0
                 print(f"{indent}├─ {player} Pos:{pos} | Sims:{sims} | Win:{win_rate:.1f}%")
-            
-            # Imprimir hijos ordenados por simulaciones
-            children = self.tree.get_children(node)
-            sorted_children = sorted(children, key=lambda x: x.data.simulations, reverse=True)
-            
-            for child in sorted_children:
-                print_node(child, depth + 1)
-        
-        root = self.tree.get(0)
-        print_node(root)
-        print()
\ No newline at end of file
+        print()
+
+def _root_search_worker(model, player, iterations, time_limit_ms, transpositions, seed):
+    """Búsqueda independiente para `MCTS.run_parallel_search`; corre en otro proceso"""
+    random.seed(seed)
+    mcts = MCTS(model, player, transpositions=transpositions)
+    if time_limit_ms is not None:
+        iterations = None
+    result = mcts.run_search(iterations=iterations, time_limit_ms=time_limit_ms)
+    done = result["iterations"] if result else 0
+
+    children = {position: (child.data.simulations, child.data.value) for position, child in mcts.get_root_children()}
+    return children, done
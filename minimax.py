@@ -0,0 +1,52 @@
+"""
+Juego perfecto de Triqui por minimax (negamax con memoria).
+Sirve como referencia para medir la calidad de las jugadas de MCTS.
+"""
+
+from functools import lru_cache
+from triqui import TicTacToeBoard, GameMove, Player, get_other_player
+
+@lru_cache(maxsize=None)
+def _negamax(human, machine, player):
+    # Resultado para `player`, que está por mover: 1 gana, 0 empata, -1 pierde
+    board = _board(human, machine)
+    winner = board.check_win()
+    if winner == "v":
+        return 0
+    if winner != "":
+        return 1 if winner == ("h" if player == Player.HUMAN else "m") else -1
+
+    best = -1
+    for position in board.get_legal_positions():
+        child = board.copy()
+        child.make_move(GameMove(player, position))
+        best = max(best, -_negamax(child.human, child.machine, get_other_player(player)))
+        if best == 1:
+            break
+    return best
+
+def _board(human, machine):
+    board = TicTacToeBoard()
+    board.set_masks(human, machine)
+    return board
+
+def evaluate(board, player):
+    """Valor exacto de la posición para `player` si le toca mover: 1, 0 o -1"""
+    return _negamax(board.human, board.machine, player)
+
+def move_values(board, player):
+    """Valor exacto de cada jugada legal de `player`, desde su punto de vista"""
+    values = {}
+    for position in board.get_legal_positions():
+        child = board.copy()
+        child.make_move(GameMove(player, position))
+        values[position] = -evaluate(child, get_other_player(player))
+    return values
+
+def best_positions(board, player):
+    """Conjunto de jugadas óptimas para `player`"""
+    values = move_values(board, player)
+    if not values:
+        return set()
+    best = max(values.values())
+    return {position for position, value in values.items() if value == best}
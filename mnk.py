@@ -0,0 +1,164 @@
+"""
+Tablero m×n con k en línea (p. ej. 15×15 con cinco en línea).
+
+La victoria se revisa solo en las cuatro líneas que pasan por la última jugada,
+y las casillas libres se mantienen en una lista que se actualiza en cada jugada,
+así que el costo de una jugada depende de k y no del tamaño del tablero.
+Ofrece la misma interfaz que `TicTacToeBoard` para que `MCTS` pueda usarlo.
+"""
+
+import random
+
+from triqui import GameMove, Player, ICONS
+
+# Direcciones de las cuatro líneas: horizontal, vertical y las dos diagonales
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+_RAYS = {}
+
+def _rays(m, n, k):
+    """rays[casilla] = pares de rayos (hacia adelante, hacia atrás) de hasta k-1 casillas por dirección"""
+    key = (m, n, k)
+    if key not in _RAYS:
+        rays = []
+        for position in range(m * n):
+            row, column = divmod(position, n)
+            pairs = []
+            for dr, dc in DIRECTIONS:
+                pair = []
+                for sign in (1, -1):
+                    ray = []
+                    for step in range(1, k):
+                        r, c = row + sign * dr * step, column + sign * dc * step
+                        if not (0 <= r < m and 0 <= c < n):
+                            break
+                        ray.append(r * n + c)
+                    pair.append(tuple(ray))
+                pairs.append(tuple(pair))
+            rays.append(tuple(pairs))
+        _RAYS[key] = rays
+    return _RAYS[key]
+
+class MNKBoard:
+    def __init__(self, m=3, n=3, k=3):
+        if k > max(m, n):
+            raise ValueError(f"No caben {k} en línea en un tablero de {m}×{n}")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.cells = m * n
+        self.rays = _rays(m, n, k)
+        # Dueño de cada casilla: None, Player.HUMAN o Player.MACHINE
+        self.owner = [None] * self.cells
+        # Casillas libres en cualquier orden, y el índice de cada una en esa lista
+        self.empty = list(range(self.cells))
+        self.empty_index = list(range(self.cells))
+        self.winner = ""
+
+    @property
+    def empty_count(self):
+        return len(self.empty)
+
+    @property
+    def grid(self):
+        return [ICONS[owner] if owner is not None else "" for owner in self.owner]
+
+    def human_make_move(self, position):
+        if not self.is_legal_position(position):
+            print(f"Movimiento ilegal! Movimientos legales: {self.get_legal_positions()}")
+            return False
+
+        self.make_move(GameMove(Player.HUMAN, position))
+        return True
+
+    def make_random_move(self, player):
+        if self.empty:
+            self.play(self.random_legal_position(), player)
+
+    def make_move(self, move):
+        self.play(move.position, move.player)
+
+    def undo_move(self, move):
+        self.unplay(move.position)
+
+    def play(self, position, player):
+        owner = self.owner
+        if owner[position] is not None:
+            raise ValueError(f"La casilla {position} ya está ocupada")
+        owner[position] = player
+
+        # Quita la casilla de las libres cambiándola por la última
+        empty = self.empty
+        index = self.empty_index[position]
+        last = empty.pop()
+        if last != position:
+            empty[index] = last
+            self.empty_index[last] = index
+
+        k = self.k
+        for forward, backward in self.rays[position]:
+            count = 1
+            for p in forward:
+                if owner[p] is not player:
+                    break
+                count += 1
+            for p in backward:
+                if owner[p] is not player:
+                    break
+                count += 1
+            if count >= k:
+                self.winner = ICONS[player]
+                break
+
+    def unplay(self, position):
+        """Deshace la jugada en `position`; las jugadas se deshacen en orden inverso"""
+        if self.owner[position] is None:
+            raise ValueError(f"La casilla {position} está vacía")
+        self.owner[position] = None
+        self.empty_index[position] = len(self.empty)
+        self.empty.append(position)
+        # Tras una victoria no se juega más, así que antes de la última jugada no había ganador
+        self.winner = ""
+
+    def random_legal_position(self):
+        return random.choice(self.empty)
+
+    def iter_legal_positions(self):
+        return self.empty
+
+    def get_legal_positions(self):
+        return sorted(self.empty)
+
+    def has_legal_positions(self):
+        return bool(self.empty)
+
+    def is_legal_position(self, position):
+        return 0 <= position < self.cells and self.owner[position] is None
+
+    def check_win(self):
+        if self.winner:
+            return self.winner
+        if not self.empty:
+            return "v"
+        return ""
+
+    def print_board(self):
+        symbols = {None: ".", Player.HUMAN: "X", Player.MACHINE: "O"}
+        width = len(str(self.cells - 1))
+        print("\nTablero actual:")
+        for row in range(self.m):
+            cells = self.owner[row * self.n:(row + 1) * self.n]
+            print(" ".join(symbols[owner].rjust(width) for owner in cells))
+
+    def copy(self):
+        board = MNKBoard.__new__(MNKBoard)
+        board.m = self.m
+        board.n = self.n
+        board.k = self.k
+        board.cells = self.cells
+        board.rays = self.rays
+        board.owner = self.owner[:]
+        board.empty = self.empty[:]
+        board.empty_index = self.empty_index[:]
+        board.winner = self.winner
+        return board
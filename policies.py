@@ -0,0 +1,53 @@
+"""
+Políticas de simulación para MCTS.
+
+Una política tiene un método `choose(model, player)` que devuelve la casilla en la
+que juega `player` sobre `model`; se pasa a `MCTS(..., rollout_policy=...)`.
+"""
+
+import random
+
+from triqui import Player, FULL_MASK, WIN_MASKS, _POSITIONS, _POPCOUNT
+
+CENTER = 1 << 4
+CORNERS = 1 << 0 | 1 << 2 | 1 << 6 | 1 << 8
+
+def _completing_cells(mask):
+    """Casillas que completan una línea para quien tiene las casillas de `mask`"""
+    cells = 0
+    for line in WIN_MASKS:
+        if _POPCOUNT[mask & line] == 2:
+            cells |= line & ~mask
+    return cells
+
+# _COMPLETES[mask]: casillas con las que el dueño de `mask` haría línea (ocupadas o no)
+_COMPLETES = [_completing_cells(mask) for mask in range(FULL_MASK + 1)]
+
+class RandomPolicy:
+    """Jugada uniforme entre las casillas libres"""
+
+    def choose(self, model, player):
+        return model.random_legal_position()
+
+class HeuristicPolicy:
+    """Gana si puede, si no bloquea, si no prefiere el centro y luego las esquinas.
+
+    Usa las máscaras `human` / `machine` del tablero de 3×3.
+    """
+
+    def choose(self, model, player):
+        legal = model.legal_mask
+        if player == Player.HUMAN:
+            own, other = model.human, model.machine
+        else:
+            own, other = model.machine, model.human
+
+        targets = _COMPLETES[own] & legal or _COMPLETES[other] & legal
+        if targets:
+            return random.choice(_POSITIONS[targets])
+        if legal & CENTER:
+            return 4
+        corners = legal & CORNERS
+        if corners:
+            return random.choice(_POSITIONS[corners])
+        return model.random_legal_position()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Servidor asyncio de partidas de Triqui contra MCTS.
+
+Protocolo: un objeto JSON por línea, en TCP o en un socket Unix. Cada respuesta
+repite el campo "id" de la petición si lo trae.
+
+    {"op": "new", "first": "human" | "machine", "time_ms": 50}
+        -> {"ok": true, "game": 1, "board": "m........", "machine": 0, "winner": ""}
+    {"op": "move", "game": 1, "position": 4, "time_ms": 50}
+        -> {"ok": true, "game": 1, "board": "m...h...m", "machine": 8, "winner": ""}
+    {"op": "close", "game": 1}
+        -> {"ok": true, "game": 1}
+
+"board" usa "h" (humano), "m" (máquina) y "." (vacía); "winner" es "", "h", "m" o "v".
+Los errores responden {"ok": false, "error": "..."}; "busy" indica que la cola de
+búsquedas está llena y conviene reintentar más tarde. Si falla el proceso de una
+búsqueda la partida se cierra y el pool se reemplaza.
+
+Las búsquedas se hacen en un pool de procesos compartido; el estado MCTS de cada
+partida se guarda entre jugadas.
+
+Uso: python server.py [--host 127.0.0.1] [--port 8765] [--unix RUTA] [--workers N]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+
+from array_tree import ArrayTree
+from mcts import MCTS
+from triqui import TicTacToeBoard, GameMove, Player
+
+class ServerBusy(Exception):
+    pass
+
+class Game:
+    def __init__(self, first, max_nodes):
+        self.board = TicTacToeBoard()
+        # Árbol en arreglos: poca memoria por partida y se serializa rápido hacia el pool
+        self.mcts = MCTS(self.board.copy(), first, tree_class=ArrayTree, solver=True,
+                         in_place=True, max_nodes=max_nodes)
+        self.lock = asyncio.Lock()
+
+    def play(self, move):
+        self.board.make_move(move)
+        self.mcts.advance(move)
+
+    def board_string(self):
+        return "".join(cell or "." for cell in self.board.grid)
+
+def _search_worker(mcts, time_ms):
+    """Búsqueda en un proceso del pool; devuelve el estado MCTS actualizado y la jugada"""
+    result = mcts.run_search(time_limit_ms=time_ms)
+    return mcts, result["move"].position
+
+class GameServer:
+    def __init__(self, workers=None, max_pending=1024, default_time_ms=50, max_time_ms=1000, max_nodes=5000):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(self.workers)
+        # Una búsqueda en vuelo por proceso; el resto espera aquí, hasta `max_pending`
+        self.slots = asyncio.Semaphore(self.workers)
+        self.max_pending = max_pending
+        self.pending = 0
+        self.default_time_ms = default_time_ms
+        self.max_time_ms = max_time_ms
+        self.max_nodes = max_nodes
+        self.games = {}
+        self.game_ids = itertools.count(1)
+        self.connections = {}
+
+    async def handle_client(self, reader, writer):
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = {}
+                try:
+                    request = json.loads(line)
+                    response = await self.dispatch(request)
+                except ServerBusy:
+                    response = {"ok": False, "error": "busy"}
+                except BrokenExecutor as error:
+                    response = {"ok": False, "error": f"La búsqueda falló: {error}"}
+                except (ValueError, KeyError, TypeError) as error:
+                    response = {"ok": False, "error": str(error)}
+                if isinstance(request, dict) and "id" in request:
+                    response["id"] = request["id"]
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self.connections[asyncio.current_task()]
+            writer.close()
+
+    async def dispatch(self, request):
+        op = request["op"]
+        if op == "new":
+            return await self.new_game(request)
+        if op == "move":
+            return await self.human_move(request)
+        if op == "close":
+            game_id = request["game"]
+            self.games.pop(game_id, None)
+            return {"ok": True, "game": game_id}
+        raise ValueError(f"Operación desconocida: {op}")
+
+    def get_time_ms(self, request):
+        return max(1, min(int(request.get("time_ms", self.default_time_ms)), self.max_time_ms))
+
+    async def new_game(self, request):
+        first = request.get("first", "human")
+        if first not in ("human", "machine"):
+            raise ValueError(f"Valor inválido para first: {first}")
+        game = Game(Player.HUMAN if first == "human" else Player.MACHINE, self.max_nodes)
+        response = {"ok": True}
+        if first == "machine":
+            async with game.lock:
+                response["machine"] = await self.machine_move(game, self.get_time_ms(request))
+        # Se registra solo si la primera jugada salió bien, para no dejar partidas sin id conocido
+        game_id = next(self.game_ids)
+        self.games[game_id] = game
+        response["game"] = game_id
+        response["board"] = game.board_string()
+        response["winner"] = game.board.check_win()
+        return response
+
+    async def human_move(self, request):
+        game_id = request["game"]
+        game = self.games.get(game_id)
+        if game is None:
+            raise ValueError(f"Partida desconocida: {game_id}")
+
+        async with game.lock:
+            position = int(request["position"])
+            if game.board.check_win() != "":
+                raise ValueError("La partida ya terminó")
+            if not game.board.is_legal_position(position):
+                raise ValueError(f"Movimiento ilegal: {position}")
+            # Se rechaza antes de jugar para que el cliente pueda reintentar la misma jugada
+            self.check_capacity()
+            game.play(GameMove(Player.HUMAN, position))
+
+            response = {"ok": True, "game": game_id}
+            if game.board.check_win() == "":
+                try:
+                    response["machine"] = await self.machine_move(game, self.get_time_ms(request))
+                except BrokenExecutor:
+                    # La jugada humana ya se aplicó y la búsqueda no: la partida no se puede seguir
+                    self.games.pop(game_id, None)
+                    raise
+            response["board"] = game.board_string()
+            response["winner"] = game.board.check_win()
+            return response
+
+    def check_capacity(self):
+        if self.pending >= self.max_pending:
+            raise ServerBusy()
+
+    async def machine_move(self, game, time_ms):
+        self.check_capacity()
+        self.pending += 1
+        try:
+            async with self.slots:
+                loop = asyncio.get_running_loop()
+                executor = self.executor
+                try:
+                    game.mcts, position = await loop.run_in_executor(executor, _search_worker, game.mcts, time_ms)
+                except BrokenExecutor:
+                    # Un proceso murió: el pool ya no sirve, las búsquedas siguientes usan uno nuevo
+                    if self.executor is executor:
+                        self.executor = ProcessPoolExecutor(self.workers)
+                        executor.shutdown(wait=False)
+                    raise
+        finally:
+            self.pending -= 1
+        game.play(GameMove(Player.MACHINE, position))
+        return position
+
+    async def start(self, host="127.0.0.1", port=8765, unix=None):
+        if unix is not None:
+            return await asyncio.start_unix_server(self.handle_client, path=unix)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def stop(self, server):
+        """Deja de aceptar conexiones, cierra las abiertas y apaga el pool"""
+        server.close()
+        for writer in self.connections.values():
+            writer.close()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        self.executor.shutdown(cancel_futures=True)
+
+async def serve(args):
+    game_server = GameServer(args.workers, args.max_pending, args.time_ms, args.max_time_ms, args.max_nodes)
+    server = await game_server.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{server.sockets[0].getsockname()[1]}"
+    print(f"Servidor de Triqui escuchando en {where} ({game_server.workers} procesos)")
+    try:
+        await server.serve_forever()
+    finally:
+        await game_server.stop(server)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="ruta de un socket Unix (en lugar de TCP)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos de búsqueda (por defecto, uno por núcleo)")
+    parser.add_argument("--max-pending", type=int, default=1024, help="búsquedas en espera antes de responder busy")
+    parser.add_argument("--time-ms", type=int, default=50, help="tiempo de búsqueda por defecto por jugada")
+    parser.add_argument("--max-time-ms", type=int, default=1000, help="tope del tiempo pedido por jugada")
+    parser.add_argument("--max-nodes", type=int, default=5000, help="nodos por partida guardados entre jugadas")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\nServidor detenido")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Instantáneas binarias del árbol de búsqueda.
+
+Formato: una cabecera fija seguida de un registro de ancho fijo por nodo, en
+orden BFS desde la raíz, de modo que los hijos de cada nodo quedan contiguos y
+basta guardar el primero y la cantidad. La carga usa `mmap` y solo crea los
+`Node` que se visitan.
+"""
+
+import mmap
+import struct
+
+from tree import Tree, Node
+from triqui import GameMove, Player
+
+MAGIC = b"TRQS"
+VERSION = 2
+
+# magic, versión, casillas, máscara del humano, máscara de la máquina, cantidad de nodos
+HEADER = struct.Struct("<4sHHIIQ")
+
+# posición, jugador, prueba, cantidad de hijos, visitas, valor, padre, primer hijo,
+# visitas AMAF, valor AMAF (RAVE)
+RECORD = struct.Struct("<bbbBIdiiId")
+
+_PLAYERS = tuple(Player)
+
+# Valor de `proof` para los nodos sin resolver
+_UNPROVEN = 2
+
+def save_tree(path, tree, model):
+    """Guarda el árbol vivo desde la raíz y el tablero de la raíz. Devuelve la cantidad de nodos."""
+    order = [tree.get_root()]
+    new_ids = {order[0].id: 0}
+    i = 0
+    while i < len(order):
+        for child in tree.get_children(order[i]):
+            new_ids[child.id] = len(order)
+            order.append(child)
+        i += 1
+
+    buffer = bytearray(HEADER.size + RECORD.size * len(order))
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, model.cells, model.human, model.machine, len(order))
+    offset = HEADER.size
+    first_child = 1
+    for node in order:
+        data = node.data
+        move = data.move
+        child_count = len(node.children_id)
+        RECORD.pack_into(buffer, offset,
+                         -1 if move.position is None else move.position,
+                         move.player.value,
+                         _UNPROVEN if data.proof is None else data.proof,
+                         child_count,
+                         data.simulations,
+                         data.value,
+                         new_ids.get(node.parent_id, -1),
+                         first_child if child_count else -1,
+                         data.amaf_simulations,
+                         data.amaf_value)
+        first_child += child_count
+        offset += RECORD.size
+
+    with open(path, "wb") as f:
+        f.write(buffer)
+    return len(order)
+
+def load_tree(path, data_class):
+    """Abre una instantánea sin leer los nodos.
+
+    Devuelve (árbol, casillas, máscara del humano, máscara de la máquina). Los datos de cada
+    nodo se crean con `data_class(move)` la primera vez que se visita.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, cells, human, machine, count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} no es una instantánea de árbol válida")
+    if len(buffer) != HEADER.size + RECORD.size * count:
+        raise ValueError(f"{path} está truncado")
+    return MappedTree(MappedNodes(buffer, count, data_class)), cells, human, machine
+
+class MappedNodes:
+    """Lista de nodos respaldada por una instantánea en `mmap`.
+
+    Los nodos del archivo se crean al leerlos y quedan en `cache`, donde también
+    se guardan sus cambios; los nodos nuevos van en `overlay`. El archivo no se modifica.
+    """
+
+    def __init__(self, buffer, count, data_class):
+        self.buffer = buffer
+        self.count = count
+        self.data_class = data_class
+        self.cache = {}
+        self.overlay = []
+
+    def __len__(self):
+        return self.count + len(self.overlay)
+
+    def __iter__(self):
+        for id in range(len(self)):
+            yield self[id]
+
+    def __getitem__(self, id):
+        if id < 0:
+            id += len(self)
+        if id >= self.count:
+            return self.overlay[id - self.count]
+        try:
+            return self.cache[id]
+        except KeyError:
+            node = self.cache[id] = self.read(id)
+            return node
+
+    def __setitem__(self, id, node):
+        if id >= self.count:
+            self.overlay[id - self.count] = node
+        else:
+            self.cache[id] = node
+
+    def append(self, node):
+        self.overlay.append(node)
+
+    def peek(self, id):
+        """Como `self[id]`, pero un nodo del archivo que no está en caché se lee sin guardarlo"""
+        if id >= self.count:
+            return self.overlay[id - self.count]
+        node = self.cache.get(id)
+        return node if node is not None else self.read(id)
+
+    def read(self, id):
+        (position, player, proof, child_count, simulations, value, parent_id, first_child,
+         amaf_simulations, amaf_value) = RECORD.unpack_from(self.buffer, HEADER.size + RECORD.size * id)
+        data = self.data_class(GameMove(_PLAYERS[player], None if position < 0 else position))
+        data.simulations = simulations
+        data.value = value
+        data.proof = None if proof == _UNPROVEN else proof
+        data.amaf_simulations = amaf_simulations
+        data.amaf_value = amaf_value
+        children_id = list(range(first_child, first_child + child_count))
+        return Node(data, id, children_id, parent_id)
+
+class MappedTree(Tree):
+    """`Tree` cuyos nodos se leen de una instantánea a medida que se usan"""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.free_ids = []
+
+    def peek_children(self, node):
+        """Hijos de `node` para recorridos de solo lectura, sin llenar el caché"""
+        # Tras `reroot` o `remove` los nodos ya están todos en una lista normal
+        if not isinstance(self.nodes, MappedNodes):
+            return self.get_children(node)
+        return [self.nodes.peek(id) for id in node.children_id]
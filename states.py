@@ -0,0 +1,223 @@
+"""
+Índice precalculado de las posiciones alcanzables del Triqui.
+
+Se enumeran una sola vez todas las posiciones a las que se llega jugando por
+turnos (empiece quien empiece) y cada una recibe un id denso: la posición se
+codifica en base 3 (0 vacía, 1 humano, 2 máquina) y una tabla de rangos lleva
+el código al id. Con esos ids se precalculan la siguiente posición por jugada
+y por jugador, las casillas libres y el resultado.
+
+Las tablas se cargan la primera vez que se crea un `StateBoard` sin tablas
+propias. Se guardan en `states.bin`, junto a este archivo (`CACHE_PATH`), para
+no recalcularlas en cada arranque; si ese directorio no se puede escribir se
+construyen en memoria cada vez.
+
+`StateBoard` usa estas tablas con la misma interfaz que `TicTacToeBoard`.
+"""
+
+import os
+import random
+import struct
+from array import array
+
+from triqui import TicTacToeBoard, FULL_MASK, _IS_WINNING, _POSITIONS, _POPCOUNT
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "states.bin")
+
+_MAGIC = b"TRQT"
+_VERSION = 1
+
+# magic, versión, cantidad de posiciones
+_HEADER = struct.Struct("<4sHI")
+
+_POW3 = tuple(3 ** i for i in range(9))
+
+# Resultado por posición, en el formato de `check_win`
+ONGOING, HUMAN_WIN, MACHINE_WIN, DRAW = 0, 1, 2, 3
+_OUTCOME_ICONS = ("", "h", "m", "v")
+
+class StateTables:
+    """Tablas indexadas por id de posición.
+
+    `next[jugador][id * 9 + casilla]` es el id tras jugar en esa casilla, o -1 si la
+    jugada no lleva a una posición alcanzable.
+    """
+
+    def __init__(self, codes, human, machine, outcome, next_human, next_machine):
+        self.codes = codes
+        self.human = human
+        self.machine = machine
+        self.outcome = outcome
+        self.next = (next_human, next_machine)
+        self.rank = array('i', [-1]) * 3 ** 9
+        for id, code in enumerate(codes):
+            self.rank[code] = id
+        self.legal_mask = array('H', (~(h | m) & FULL_MASK for h, m in zip(human, machine)))
+        self.legal_positions = [_POSITIONS[mask] for mask in self.legal_mask]
+        self.outcome_icons = [_OUTCOME_ICONS[result] for result in outcome]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def get_id(self, human, machine):
+        code = sum(_POW3[i] for i in _POSITIONS[human]) + sum(2 * _POW3[i] for i in _POSITIONS[machine])
+        id = self.rank[code] if not human & machine else -1
+        if id < 0:
+            raise ValueError("La posición no se alcanza jugando por turnos")
+        return id
+
+def _outcome(human, machine):
+    if _IS_WINNING[human]:
+        return HUMAN_WIN
+    if _IS_WINNING[machine]:
+        return MACHINE_WIN
+    if human | machine == FULL_MASK:
+        return DRAW
+    return ONGOING
+
+def build_tables():
+    """Enumera las posiciones alcanzables desde el tablero vacío, con cualquiera de los dos empezando"""
+    index = {(0, 0): 0}
+    positions = [(0, 0)]
+    i = 0
+    while i < len(positions):
+        human, machine = positions[i]
+        if _outcome(human, machine) == ONGOING:
+            count_human, count_machine = _POPCOUNT[human], _POPCOUNT[machine]
+            for position in _POSITIONS[~(human | machine) & FULL_MASK]:
+                bit = 1 << position
+                children = []
+                if count_human <= count_machine:
+                    children.append((human | bit, machine))
+                if count_machine <= count_human:
+                    children.append((human, machine | bit))
+                for child in children:
+                    if child not in index:
+                        index[child] = len(positions)
+                        positions.append(child)
+        i += 1
+
+    codes = array('i', (sum(_POW3[i] for i in _POSITIONS[h]) + sum(2 * _POW3[i] for i in _POSITIONS[m])
+                        for h, m in positions))
+    human = array('H', (h for h, _ in positions))
+    machine = array('H', (m for _, m in positions))
+    outcome = array('b', (_outcome(h, m) for h, m in positions))
+
+    next_human = array('h', [-1]) * (9 * len(positions))
+    next_machine = array('h', [-1]) * (9 * len(positions))
+    for id, (h, m) in enumerate(positions):
+        if outcome[id] != ONGOING:
+            continue
+        for position in _POSITIONS[~(h | m) & FULL_MASK]:
+            bit = 1 << position
+            next_human[id * 9 + position] = index.get((h | bit, m), -1)
+            next_machine[id * 9 + position] = index.get((h, m | bit), -1)
+
+    return StateTables(codes, human, machine, outcome, next_human, next_machine)
+
+def _columns(tables):
+    return (tables.codes, tables.human, tables.machine, tables.outcome, tables.next[0], tables.next[1])
+
+def save_tables(tables, path=CACHE_PATH):
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(tables)))
+        for column in _columns(tables):
+            column.tofile(f)
+
+def read_tables(path=CACHE_PATH):
+    """Lee las tablas del disco; devuelve None si el archivo no existe o no es válido"""
+    try:
+        with open(path, "rb") as f:
+            magic, version, count = _HEADER.unpack(f.read(_HEADER.size))
+            columns = [array('i'), array('H'), array('H'), array('b'), array('h'), array('h')]
+            for column, length in zip(columns, (count, count, count, count, 9 * count, 9 * count)):
+                column.fromfile(f, length)
+            if f.read(1):
+                return None
+    except (OSError, EOFError, struct.error):
+        return None
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    return StateTables(*columns)
+
+def load_tables(path=CACHE_PATH):
+    """Tablas desde el caché en disco, o construidas (y guardadas, si se puede) si no hay caché"""
+    tables = read_tables(path)
+    if tables is None:
+        tables = build_tables()
+        try:
+            save_tables(tables, path)
+        except OSError:
+            pass
+    return tables
+
+_tables = None
+
+def get_tables():
+    """Tablas compartidas, cargadas (o construidas) en la primera llamada"""
+    global _tables
+    if _tables is None:
+        _tables = load_tables()
+    return _tables
+
+class StateBoard(TicTacToeBoard):
+    """Tablero representado por el id de su posición: cada jugada y cada consulta es una búsqueda en tabla.
+
+    Solo admite posiciones alcanzables jugando por turnos.
+    """
+
+    def __init__(self, tables=None):
+        self.tables = tables if tables is not None else get_tables()
+        self.state = 0
+
+    @property
+    def human(self):
+        return self.tables.human[self.state]
+
+    @property
+    def machine(self):
+        return self.tables.machine[self.state]
+
+    @property
+    def legal_mask(self):
+        return self.tables.legal_mask[self.state]
+
+    @property
+    def empty_count(self):
+        return _POPCOUNT[self.tables.legal_mask[self.state]]
+
+    def set_masks(self, human, machine):
+        self.state = self.tables.get_id(human, machine)
+
+    def play(self, position, player):
+        state = self.tables.next[player.value][self.state * 9 + position]
+        if state < 0:
+            raise ValueError(f"Jugada fuera de la tabla de posiciones: {position}")
+        self.state = state
+
+    def unplay(self, position):
+        tables = self.tables
+        code = tables.codes[self.state]
+        cell = code // _POW3[position] % 3
+        state = tables.rank[code - cell * _POW3[position]] if cell else -1
+        if state < 0:
+            raise ValueError(f"Jugada fuera de la tabla de posiciones: {position}")
+        self.state = state
+
+    def random_legal_position(self):
+        return random.choice(self.tables.legal_positions[self.state])
+
+    def iter_legal_positions(self):
+        return self.tables.legal_positions[self.state]
+
+    def get_legal_positions(self):
+        return list(self.tables.legal_positions[self.state])
+
+    def check_win(self):
+        return self.tables.outcome_icons[self.state]
+
+    def copy(self):
+        board = StateBoard.__new__(StateBoard)
+        board.tables = self.tables
+        board.state = self.state
+        return board
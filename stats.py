@@ -0,0 +1,66 @@
+import time
+
+PHASES = ("select", "expand", "simulate", "backpropagate")
+
+class SearchStats:
+    """Estadísticas de una búsqueda MCTS.
+
+    Los contadores se actualizan en cada iteración; los tiempos por fase solo se
+    miden en una de cada `sample_every` iteraciones y se extrapolan al total.
+    """
+
+    def __init__(self, sample_every=8):
+        self.sample_every = sample_every
+        self.iterations = 0
+        self.sampled_iterations = 0
+        self.phase_time = {phase: 0.0 for phase in PHASES}
+        self.nodes_allocated = 0
+        self.max_depth = 0
+        self.rollouts = 0
+        self.rollout_plies = 0
+        self.elapsed = 0.0
+
+    def start_iteration(self):
+        """Devuelve el instante de inicio si esta iteración se mide, o None"""
+        if self.iterations % self.sample_every == 0:
+            self.sampled_iterations += 1
+            return time.perf_counter()
+        return None
+
+    def lap(self, phase, started):
+        now = time.perf_counter()
+        self.phase_time[phase] += now - started
+        return now
+
+    def record_iteration(self, depth, new_node, plies=None):
+        self.iterations += 1
+        if new_node:
+            self.nodes_allocated += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if plies is not None:
+            self.rollouts += 1
+            self.rollout_plies += plies
+
+    def estimated_phase_time(self, phase):
+        """Tiempo total estimado de la fase, en segundos"""
+        if self.sampled_iterations == 0:
+            return 0.0
+        return self.phase_time[phase] * self.iterations / self.sampled_iterations
+
+    def iterations_per_second(self):
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+    def average_rollout_length(self):
+        return self.rollout_plies / self.rollouts if self.rollouts else 0.0
+
+    def as_dict(self):
+        return {
+            "iterations": self.iterations,
+            "elapsed": self.elapsed,
+            "iterations_per_second": self.iterations_per_second(),
+            "phase_time": {phase: self.estimated_phase_time(phase) for phase in PHASES},
+            "nodes_allocated": self.nodes_allocated,
+            "max_depth": self.max_depth,
+            "average_rollout_length": self.average_rollout_length(),
+        }
@@ -2,30 +2,71 @@ class Tree:
     def __init__(self, root):
         root.id = 0
         self.nodes = [root]
+        # Ids liberados por `release`, reutilizados por `insert`
+        self.free_ids = []
+
+    def __len__(self):
+        return len(self.nodes) - len(self.free_ids)
 
     def get(self, id):
         return self.nodes[id]
 
     def insert(self, node, parent):
-        node.id = len(self.nodes)
         node.parent_id = parent.id
-        self.nodes.append(node)
+        if self.free_ids:
+            node.id = self.free_ids.pop()
+            self.nodes[node.id] = node
+        else:
+            node.id = len(self.nodes)
+            self.nodes.append(node)
         self.nodes[node.parent_id].children_id.append(node.id)
+        return node
 
-    def remove(self, node):
-        removed_ids = self.remove_rec(node)
-        self.nodes = [f for f in self.nodes if f is not None]
+    def release(self, node):
+        """Quita el subárbol de `node` dejando huecos reutilizables, sin renumerar.
+
+        Devuelve la cantidad de nodos liberados.
+        """
+        if node.is_root():
+            return 0
+        self.get_parent(node).children_id.remove(node.id)
+
+        released = 0
+        pending = [node.id]
+        while pending:
+            id = pending.pop()
+            pending.extend(self.nodes[id].children_id)
+            self.nodes[id] = None
+            self.free_ids.append(id)
+            released += 1
+        return released
+
+    def contains(self, node):
+        return self.nodes[node.id] is node
+
+    def iter_nodes(self):
+        """Recorre los nodos vivos"""
+        for node in self.nodes:
+            if node is not None:
+                yield node
 
-        for i in range(len(self.nodes)):
-            removed_before_id = self.removed_before(self.nodes[i].id, removed_ids)
-            self.nodes[i].id -= removed_before_id
+    def remove(self, node):
+        removed_ids = set(self.remove_rec(node))
+        if not removed_ids:
+            return
 
-            removed_before_parent_id = self.removed_before(self.nodes[i].parent_id, removed_ids)
-            self.nodes[i].parent_id -= removed_before_parent_id
+        # Nuevo id de cada nodo conservado, en una sola pasada
+        new_ids = {}
+        for old_id, current in enumerate(self.nodes):
+            if current is not None:
+                new_ids[old_id] = len(new_ids)
 
-            for j in range(len(self.nodes[i].children_id)):
-                removed_before_children_id = self.removed_before(self.nodes[i].children_id[j], removed_ids)
-                self.nodes[i].children_id[j] -= removed_before_children_id
+        self.nodes = [f for f in self.nodes if f is not None]
+        self.free_ids = []
+        for current in self.nodes:
+            current.id = new_ids[current.id]
+            current.parent_id = new_ids.get(current.parent_id, -1)
+            current.children_id = [new_ids[child_id] for child_id in current.children_id]
 
     def remove_rec(self, node):
         removed = []
@@ -50,12 +91,33 @@ class Tree:
 
         return removed
 
-    def removed_before(self, id, removed_id):
-        num = 0
-        for removed in removed_id:
-            if removed < id:
-                num += 1
-        return num
+    def reroot(self, node):
+        """Convierte `node` en la nueva raíz y descarta el resto del árbol.
+
+        Solo recorre el subárbol conservado. Devuelve el mapa de ids viejos a nuevos.
+        """
+        new_ids = {node.id: 0}
+        kept = [node]
+        i = 0
+        while i < len(kept):
+            current = kept[i]
+            for child_id in current.children_id:
+                if child_id not in new_ids:
+                    new_ids[child_id] = len(kept)
+                    child = self.nodes[child_id]
+                    child.parent_id = current.id
+                    kept.append(child)
+            i += 1
+
+        for current in kept:
+            current.id = new_ids[current.id]
+            current.parent_id = new_ids.get(current.parent_id, -1)
+            current.children_id = [new_ids[child_id] for child_id in current.children_id]
+
+        node.parent_id = -1
+        self.nodes = kept
+        self.free_ids = []
+        return new_ids
 
     def update(self, node, new_data):
         self.nodes[node.id].data = new_data
@@ -80,9 +142,10 @@ class Tree:
     def copy(self):
         arr = []
         for node in self.nodes:
-            arr.append(node.copy())
+            arr.append(node.copy() if node is not None else None)
         new_tree = Tree(arr[0])
         new_tree.nodes = arr[:]
+        new_tree.free_ids = self.free_ids[:]
         return new_tree
 
 
@@ -5,12 +5,11 @@ class Player(Enum):
     HUMAN = 0
     MACHINE = 1
 
+ICONS = {Player.HUMAN: "h", Player.MACHINE: "m"}
+
 def get_other_player(player):
     return Player.MACHINE if player == Player.HUMAN else Player.HUMAN
 
-def are_equal(arr):
-    return all(x == arr[0] for x in arr) and arr[0] != ""
-
 class GameMove:
     def __init__(self, player, position):
         self.player = player
@@ -19,9 +18,67 @@ class GameMove:
     def copy(self):
         return GameMove(self.player, self.position)
 
+# Máscaras de bits: la casilla i corresponde al bit (1 << i)
+FULL_MASK = 0b111111111
+
+WIN_MASKS = (
+    # Rows
+    0b000000111, 0b000111000, 0b111000000,
+    # Columns
+    0b001001001, 0b010010010, 0b100100100,
+    # Diagonals
+    0b100010001, 0b001010100,
+)
+
+# Las 8 simetrías del tablero 3x3: SYMMETRIES[s][i] es la casilla a la que va la casilla i
+SYMMETRIES = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),  # Identidad
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),  # Rotación 90°
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),  # Rotación 180°
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),  # Rotación 270°
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),  # Reflejo horizontal
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),  # Reflejo vertical
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),  # Diagonal principal
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),  # Diagonal secundaria
+)
+
+# Tablas precalculadas indexadas por máscara de 9 bits
+_IS_WINNING = [any(mask & win == win for win in WIN_MASKS) for mask in range(FULL_MASK + 1)]
+_POSITIONS = [tuple(i for i in range(9) if mask >> i & 1) for mask in range(FULL_MASK + 1)]
+_POPCOUNT = [bin(mask).count("1") for mask in range(FULL_MASK + 1)]
+_SYMMETRIC_MASKS = [
+    [sum(1 << symmetry[i] for i in _POSITIONS[mask]) for mask in range(FULL_MASK + 1)]
+    for symmetry in SYMMETRIES
+]
+
+def canonical_key(human, machine):
+    """Clave de la posición, idéntica para las 8 posiciones simétricas"""
+    return min(table[human] << 9 | table[machine] for table in _SYMMETRIC_MASKS)
+
 class TicTacToeBoard:
+    cells = 9
+
     def __init__(self):
-        self.grid = [""] * 9
+        self.human = 0
+        self.machine = 0
+        # Casillas libres y su cantidad, actualizadas en cada jugada
+        self.legal_mask = FULL_MASK
+        self.empty_count = 9
+
+    @property
+    def grid(self):
+        return ["h" if self.human >> i & 1 else "m" if self.machine >> i & 1 else "" for i in range(9)]
+
+    @grid.setter
+    def grid(self, grid):
+        self.set_masks(sum(1 << i for i, cell in enumerate(grid) if cell == "h"),
+                       sum(1 << i for i, cell in enumerate(grid) if cell == "m"))
+
+    def set_masks(self, human, machine):
+        self.human = human
+        self.machine = machine
+        self.legal_mask = ~(human | machine) & FULL_MASK
+        self.empty_count = _POPCOUNT[self.legal_mask]
 
     def human_make_move(self, position):
         if position not in self.get_legal_positions():
@@ -32,40 +89,68 @@ class TicTacToeBoard:
         return True
 
     def make_random_move(self, player):
-        legal_moves = self.get_legal_positions()
-        if legal_moves:
-            position = random.choice(legal_moves)
-            self.make_move(GameMove(player, position))
+        if self.legal_mask:
+            self.play(self.random_legal_position(), player)
 
     def make_move(self, move):
-        self.grid[move.position] = "h" if move.player == Player.HUMAN else "m"
+        self.play(move.position, move.player)
+
+    def undo_move(self, move):
+        self.unplay(move.position)
+
+    def play(self, position, player):
+        """Como make_move, pero sin crear un GameMove"""
+        bit = 1 << position
+        if not self.legal_mask & bit:
+            raise ValueError(f"La casilla {position} ya está ocupada")
+        if player == Player.HUMAN:
+            self.human |= bit
+        else:
+            self.machine |= bit
+        self.legal_mask &= ~bit
+        self.empty_count -= 1
+
+    def unplay(self, position):
+        """Deshace la jugada en `position`, sea de quien sea"""
+        bit = 1 << position
+        if self.legal_mask & bit:
+            raise ValueError(f"La casilla {position} está vacía")
+        self.human &= ~bit
+        self.machine &= ~bit
+        self.legal_mask |= bit
+        self.empty_count += 1
+
+    def random_legal_position(self):
+        return random.choice(_POSITIONS[self.legal_mask])
+
+    def iter_legal_positions(self):
+        """Casillas libres sin crear una lista nueva (tupla precalculada)"""
+        return _POSITIONS[self.legal_mask]
 
     def get_legal_positions(self):
-        return [i for i, cell in enumerate(self.grid) if cell == ""]
+        return list(_POSITIONS[self.legal_mask])
 
     def has_legal_positions(self):
-        return len(self.get_legal_positions()) > 0
+        return self.legal_mask != 0
 
     def is_legal_position(self, position):
-        return position in self.get_legal_positions()
+        return 0 <= position < 9 and self.legal_mask >> position & 1 == 1
 
-    def check_win(self):
-        # Rows
-        if are_equal([self.grid[0], self.grid[1], self.grid[2]]): return self.grid[0]
-        if are_equal([self.grid[3], self.grid[4], self.grid[5]]): return self.grid[3]
-        if are_equal([self.grid[6], self.grid[7], self.grid[8]]): return self.grid[6]
+    def canonical_key(self):
+        return canonical_key(self.human, self.machine)
 
-        # Columns
-        if are_equal([self.grid[0], self.grid[3], self.grid[6]]): return self.grid[0]
-        if are_equal([self.grid[1], self.grid[4], self.grid[7]]): return self.grid[1]
-        if are_equal([self.grid[2], self.grid[5], self.grid[8]]): return self.grid[2]
+    def canonical_key_after(self, move):
+        """Clave canónica de la posición que resultaría de `move`, sin modificar el tablero"""
+        if move.player == Player.HUMAN:
+            return canonical_key(self.human | 1 << move.position, self.machine)
+        return canonical_key(self.human, self.machine | 1 << move.position)
 
-        # Diagonals
-        if are_equal([self.grid[0], self.grid[4], self.grid[8]]): return self.grid[4]
-        if are_equal([self.grid[2], self.grid[4], self.grid[6]]): return self.grid[4]
+    def check_win(self):
+        if _IS_WINNING[self.human]: return "h"
+        if _IS_WINNING[self.machine]: return "m"
 
         # Draw
-        if not self.has_legal_positions(): 
+        if not self.legal_mask:
             return "v"
 
         return ""
@@ -77,9 +162,9 @@ class TicTacToeBoard:
             row = ""
             for j in range(3):
                 pos = i * 3 + j
-                if self.grid[pos] == "h":
+                if self.human >> pos & 1:
                     row += " X "
-                elif self.grid[pos] == "m":
+                elif self.machine >> pos & 1:
                     row += " O "
                 else:
                     row += "   "
@@ -91,6 +176,9 @@ class TicTacToeBoard:
         print("   |   |   ")
 
     def copy(self):
-        board = TicTacToeBoard()
-        board.grid = self.grid[:]
+        board = TicTacToeBoard.__new__(TicTacToeBoard)
+        board.human = self.human
+        board.machine = self.machine
+        board.legal_mask = self.legal_mask
+        board.empty_count = self.empty_count
         return board